@@ -609,7 +609,7 @@ def compile_sketch(sketch_dir: Path, build_mode: str) -> Exception | None:
     )
 
     # Add output file
-    link_flags.extend(["-o", "fastled.js"])
+    link_flags.extend(["-o", str(output_js)])
 
     # Add debug-specific flags if needed
     if build_mode.lower() == "debug" and dwarf_file:
@@ -643,7 +643,6 @@ def compile_sketch(sketch_dir: Path, build_mode: str) -> Exception | None:
         )
     else:
         raise ValueError(f"Invalid build mode: {build_mode}")
-    cmd_link[cmd_link.index("-o") + 1] = str(output_js)
     if build_mode.lower() == "debug":
         dwarf_file = output_dir / "fastled.wasm.dwarf"
         cmd_link.append(f"-gseparate-dwarf={dwarf_file}")
@@ -15,6 +15,7 @@ Key differences from compile_sketch.py:
 import argparse
 import os
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 from fastled_wasm_compiler import paths
@@ -23,6 +24,11 @@ from fastled_wasm_compiler.emsdk_manager import get_emsdk_manager
 from fastled_wasm_compiler.fastled_downloader import ensure_fastled_installed
 
 
+def _max_compile_workers() -> int:
+    """Upper bound on the number of sketch sources compiled at once."""
+    return os.cpu_count() or 4
+
+
 class NativeCompilerImpl:
     """Native EMSDK-based compiler for FastLED sketches."""
 
@@ -107,12 +113,18 @@ class NativeCompilerImpl:
             Path to generated object file
         """
         self.ensure_emsdk()
+        return self._compile_source_to_object(source_file, build_mode, build_dir)
 
+    def _compile_source_to_object(
+        self, source_file: Path, build_mode: str, build_dir: Path
+    ) -> Path:
+        """Compile a single source file, assuming EMSDK is already installed."""
         # Set up build directory
         build_dir.mkdir(parents=True, exist_ok=True)
 
-        # Generate object file path
-        obj_file = build_dir / f"{source_file.stem}.o"
+        # Generate object file path. Keep the suffix so foo.cpp and foo.ino
+        # never share an object file when compiled in parallel.
+        obj_file = build_dir / f"{source_file.name}.o"
 
         # Get compilation flags
         flags = self.get_compilation_flags(build_mode)
@@ -269,11 +281,21 @@ class NativeCompilerImpl:
         build_dir = output_dir / "build" / build_mode.lower()
         build_dir.mkdir(parents=True, exist_ok=True)
 
-        # Compile sketch source files only (not FastLED)
-        object_files = []
-        for source_file in source_files:
-            obj_file = self.compile_source_to_object(source_file, build_mode, build_dir)
-            object_files.append(obj_file)
+        # Install EMSDK up front so parallel compiles never race to install it
+        self.ensure_emsdk()
+
+        # Compile sketch source files only (not FastLED) in parallel. map()
+        # keeps source order so the link command stays deterministic.
+        max_workers = min(len(source_files), _max_compile_workers())
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            object_files = list(
+                executor.map(
+                    lambda source_file: self._compile_source_to_object(
+                        source_file, build_mode, build_dir
+                    ),
+                    source_files,
+                )
+            )
 
         # Link sketch objects + pre-built FastLED library to WASM
         js_file = self.link_objects_to_wasm(
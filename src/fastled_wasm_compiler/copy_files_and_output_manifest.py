@@ -1,10 +1,15 @@
 import json
+import os
 import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
 
-from fastled_wasm_compiler.hashfile import hash_file
+from fastled_wasm_compiler.hashfile import copy_and_hash_file
 from fastled_wasm_compiler.print_banner import banner
 
+# Number of threads used to copy build output into the output directory
+_COPY_WORKERS = 8
+
 
 def process_embedded_data_directory(
     input_data_dir: Path, output_data_dir: Path
@@ -22,54 +27,82 @@ def process_embedded_data_directory(
     manifest: list[dict] = []
 
     if input_data_dir.exists():
+        # One scandir pass: DirEntry caches the stat, so each file is stat'ed once
+        with os.scandir(input_data_dir) as it:
+            # Only copy files, not directories
+            entries = [entry for entry in it if entry.is_file()]
+
         # Clean up existing output data directory
         if output_data_dir.exists():
-            for _file in output_data_dir.iterdir():
-                _file.unlink()
+            with os.scandir(output_data_dir) as it:
+                for entry in it:
+                    os.unlink(entry.path)
+
+        if not entries:
+            # Nothing to copy, so don't create an empty output directory
+            return manifest
 
         # Create output data directory and copy files
         output_data_dir.mkdir(parents=True, exist_ok=True)
-        for _file in input_data_dir.iterdir():
-            if _file.is_file():  # Only copy files, not directories
-                filename: str = _file.name
-                if filename.endswith(".embedded.json"):
-                    print(banner("Embedding data file"))
-                    filename_no_embedded = filename.replace(".embedded.json", "")
-                    # read json file
-                    with open(_file, "r") as f:
-                        data = json.load(f)
-                    hash_value = data["hash"]
-                    size = data["size"]
-                    manifest.append(
-                        {
-                            "name": filename_no_embedded,
-                            "path": f"data/{filename_no_embedded}",
-                            "size": size,
-                            "hash": hash_value,
-                        }
-                    )
-                else:
-                    print(f"Copying {_file.name} -> {output_data_dir}")
-                    shutil.copy2(_file, output_data_dir / _file.name)
-                    hash = hash_file(_file)
-                    manifest.append(
-                        {
-                            "name": _file.name,
-                            "path": f"data/{_file.name}",
-                            "size": _file.stat().st_size,
-                            "hash": hash,
-                        }
-                    )
+        for entry in entries:
+            filename: str = entry.name
+            if filename.endswith(".embedded.json"):
+                print(banner("Embedding data file"))
+                filename_no_embedded = filename.replace(".embedded.json", "")
+                # read json file
+                with open(entry.path, "r") as f:
+                    data = json.load(f)
+                hash_value = data["hash"]
+                size = data["size"]
+                manifest.append(
+                    {
+                        "name": filename_no_embedded,
+                        "path": f"data/{filename_no_embedded}",
+                        "size": size,
+                        "hash": hash_value,
+                    }
+                )
+            else:
+                print(f"Copying {filename} -> {output_data_dir}")
+                hash = copy_and_hash_file(Path(entry.path), output_data_dir / filename)
+                manifest.append(
+                    {
+                        "name": filename,
+                        "path": f"data/{filename}",
+                        "size": entry.stat().st_size,
+                        "hash": hash,
+                    }
+                )
 
     return manifest
 
 
-def find_all_files_from_root_js() -> list[Path]:
-    """
-    Find all files in the root directory of the js folder.
-    """
-    root_dir = Path("/")
-    return list(root_dir.glob("**/*"))
+def _prune_stale_entries(src: Path, dest: Path) -> None:
+    """Remove entries under dest that are missing from src, or changed kind."""
+    with os.scandir(src) as it:
+        src_is_dir = {entry.name: entry.is_dir() for entry in it}
+    with os.scandir(dest) as it:
+        for entry in it:
+            is_dir = entry.is_dir(follow_symlinks=False)
+            if src_is_dir.get(entry.name) is not is_dir:
+                if is_dir:
+                    shutil.rmtree(entry.path)
+                else:
+                    os.unlink(entry.path)
+            elif is_dir:
+                _prune_stale_entries(src / entry.name, Path(entry.path))
+
+
+def _copy_dist_item(item: Path, dest: Path) -> None:
+    """Copy one entry of the Vite dist/ directory to dest, replacing it."""
+    if item.is_dir():
+        # Update the existing tree in place and only drop what dist/ no
+        # longer has (e.g. old hashed chunks), instead of deleting it all
+        if dest.is_dir() and not dest.is_symlink():
+            _prune_stale_entries(item, dest)
+        shutil.copytree(item, dest, dirs_exist_ok=True)
+    else:
+        shutil.copy2(item, dest)
 
 
 def copy_output_files_and_create_manifest(
@@ -94,12 +127,6 @@ def copy_output_files_and_create_manifest(
     out_dir: Path = src_dir / fastled_js_out
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # Copy all fastled.* build artifacts
-    for file_path in build_dir.glob("fastled.*"):
-        _dst = out_dir / file_path.name
-        print(f"Copying {file_path} to {_dst}")
-        shutil.copy2(file_path, _dst)
-
     # Copy Vite build output from dist/
     dist_dir = assets_dir / "dist"
     if not dist_dir.exists():
@@ -108,15 +135,27 @@ def copy_output_files_and_create_manifest(
             + f"Run 'npm install && npx vite build' in {assets_dir}"
         )
 
-    print(f"Copying Vite build output from {dist_dir} to {out_dir}")
-    for item in dist_dir.iterdir():
-        dest = out_dir / item.name
-        if item.is_dir():
-            if dest.exists():
-                shutil.rmtree(dest)
-            shutil.copytree(item, dest)
-        else:
-            shutil.copy2(item, dest)
+    # The copies mostly wait on the filesystem, so each batch runs in a thread
+    # pool. dist/ is copied only after the build artifacts are in place, so
+    # it still overwrites any artifact with the same name, as before.
+    with ThreadPoolExecutor(max_workers=_COPY_WORKERS) as executor:
+        # Copy all fastled.* build artifacts
+        futures: list[Future[object]] = []
+        for file_path in build_dir.glob("fastled.*"):
+            _dst = out_dir / file_path.name
+            print(f"Copying {file_path} to {_dst}")
+            futures.append(executor.submit(shutil.copy2, file_path, _dst))
+        # Re-raise the first copy failure, if any
+        for future in futures:
+            future.result()
+
+        print(f"Copying Vite build output from {dist_dir} to {out_dir}")
+        futures = [
+            executor.submit(_copy_dist_item, item, out_dir / item.name)
+            for item in dist_dir.iterdir()
+        ]
+        for future in futures:
+            future.result()
 
     optional_input_data_dir = src_dir / "data"
     output_data_dir = out_dir / optional_input_data_dir.name
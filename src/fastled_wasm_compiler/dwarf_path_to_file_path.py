@@ -1,3 +1,4 @@
+import functools
 import logging
 import platform
 import time
@@ -146,32 +147,19 @@ SOURCE_PATHS = [
 SOURCE_PATHS_NO_LEADING_SLASH = [p.lstrip("/") for p in SOURCE_PATHS]
 
 
-def _get_current_prefixes() -> list[str]:
-    """Get current prefixes (refreshed periodically)."""
-    return list(_dwarf_config_manager.get_prefixes())
-
-
 def dwarf_path_to_file_path(
     request_path: str,
     check_exists: bool = True,
 ) -> Path | Exception:
     """Resolve the path for dwarfsource with periodic config reloading."""
     # Force a check for config updates before resolving paths
-    _dwarf_config_manager.get_config()  # This will reload if needed
+    prefixes = _dwarf_config_manager.get_prefixes()  # This will reload if needed
 
     logger.debug(f"Resolving dwarf path: {request_path}")
-    path_or_error = _dwarf_path_to_file_path_inner(request_path)
-    if isinstance(path_or_error, Exception):
-        logger.error(f"Failed to resolve path: {request_path}, error: {path_or_error}")
-        return path_or_error
-    path: str = path_or_error
-    if "//" in path:
-        # this is a security check.
-        logger.warning(f"Security check: replaced // in path: {path}")
-        path = path.replace("//", "/")
-
-    # Convert to Path and handle platform-specific issues
-    out = Path(path)
+    out = _resolve_no_io(request_path, prefixes)
+    if isinstance(out, Exception):
+        logger.error(f"Failed to resolve path: {request_path}, error: {out}")
+        return out
 
     # For testing purposes, if we have an absolute path that looks like it should be relative,
     # convert it to the expected relative format
@@ -195,7 +183,62 @@ def dwarf_path_to_file_path(
     return out
 
 
+class _UnresolvedPathError(Exception):
+    """Carries a resolution error out of _resolve_path_cached uncached."""
+
+    def __init__(self, error: Exception):
+        super().__init__(str(error))
+        self.error = error
+
+
+def _resolve_no_io(
+    request_path: str, prefixes: tuple[str, str, str]
+) -> Path | Exception:
+    """Resolve request_path without touching the filesystem.
+
+    Successful resolutions are cached. Errors are built fresh on every call,
+    and the security checks below log on every call.
+    """
+    if (
+        ".." in request_path
+    ):  # we never have .. in the path so someone is trying weird stuff.
+        msg = f"Invalid path with '..' detected: {request_path}"
+        logger.warning(msg)
+        warnings.warn(msg)
+        return Exception(f"Invalid path: {request_path}")
+
+    try:
+        path = _resolve_path_cached(request_path, prefixes)
+    except _UnresolvedPathError as e:
+        return e.error
+    if "//" in path:
+        # this is a security check.
+        logger.warning(f"Security check: replaced // in path: {path}")
+        path = path.replace("//", "/")
+
+    # Convert to Path and handle platform-specific issues
+    return Path(path)
+
+
+@functools.lru_cache(maxsize=1024)
+def _resolve_path_cached(request_path: str, prefixes: tuple[str, str, str]) -> str:
+    """Cached body of _resolve_no_io, a pure function of the path and prefixes.
+
+    Raises _UnresolvedPathError on failure, which lru_cache does not cache.
+    """
+    path_or_error = _dwarf_path_to_file_path_inner(request_path, prefixes)
+    if isinstance(path_or_error, Exception):
+        raise _UnresolvedPathError(path_or_error)
+    return path_or_error
+
+
 def prune_paths(path: str) -> str | None:
+    return _prune_paths(path, _dwarf_config_manager.get_prefixes())
+
+
+@functools.lru_cache(maxsize=1024)
+def _prune_paths(path: str, current_prefixes: tuple[str, str, str]) -> str | None:
+    """Cached body of prune_paths, keyed on the path and the current prefixes."""
     logger.debug(f"Pruning path: {path}")
     if path.startswith("/"):
         path = path[1:]
@@ -203,7 +246,6 @@ def prune_paths(path: str) -> str | None:
     # pop off the leaf and store it in a buffer.
     # When you hit one of the current PREFIXES, then stop
     # and return the path that was popped.
-    current_prefixes = _get_current_prefixes()
     logger.debug(f"Using current prefixes: {current_prefixes}")
     parts = p.parts
     buffer = []
@@ -242,19 +284,11 @@ def prune_paths(path: str) -> str | None:
 
 
 def _dwarf_path_to_file_path_inner(
-    request_path: str,
+    request_path: str, prefixes: tuple[str, str, str]
 ) -> str | Exception:
     """Resolve the path for dwarfsource."""
     print(f"Inner path resolution for: {request_path}")
-    if (
-        ".." in request_path
-    ):  # we never have .. in the path so someone is trying weird stuff.
-        msg = f"Invalid path with '..' detected: {request_path}"
-        logger.warning(msg)
-        warnings.warn(msg)
-        return Exception(f"Invalid path: {request_path}")
-
-    request_path_pruned = prune_paths(request_path)
+    request_path_pruned = _prune_paths(request_path, prefixes)
     if request_path_pruned is None:
         print(f"Failed to prune path: {request_path}")
         return Exception(f"Invalid path: {request_path}")
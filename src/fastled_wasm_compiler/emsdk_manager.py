@@ -79,9 +79,16 @@ class EmsdkManager:
 
     def _detect_platform(self) -> EmsdkPlatform:
         """Detect current platform and return appropriate EMSDK platform info."""
-        system = platform.system()
-        machine = platform.machine()
+        return self.detect_platform_info(platform.system(), platform.machine())
 
+    @classmethod
+    def detect_platform_info(cls, system: str, machine: str) -> EmsdkPlatform:
+        """Return the EMSDK platform info for a system/machine pair.
+
+        Args:
+            system: Value as reported by platform.system()
+            machine: Value as reported by platform.machine()
+        """
         # Normalize machine names
         if machine in ("AMD64", "x86_64", "amd64"):
             machine = "x86_64"
@@ -90,13 +97,13 @@ class EmsdkManager:
 
         platform_key = (system, machine)
 
-        if platform_key not in self.PLATFORMS:
-            supported = ", ".join(f"{k[0]}-{k[1]}" for k in self.PLATFORMS.keys())
+        if platform_key not in cls.PLATFORMS:
+            supported = ", ".join(f"{k[0]}-{k[1]}" for k in cls.PLATFORMS.keys())
             raise RuntimeError(
                 f"Unsupported platform {system}-{machine}. Supported: {supported}"
             )
 
-        return self.PLATFORMS[platform_key]
+        return cls.PLATFORMS[platform_key]
 
     def is_installed(self) -> bool:
         """Check if EMSDK is already installed and functional."""
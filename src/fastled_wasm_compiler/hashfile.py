@@ -1,6 +1,10 @@
 import hashlib
+import shutil
 from pathlib import Path
 
+# Read size used when copying and hashing in one pass
+_COPY_CHUNK_SIZE = 1 << 20
+
 
 def hash_file(file_path: Path) -> str:
     hasher = hashlib.md5()
@@ -8,3 +12,18 @@ def hash_file(file_path: Path) -> str:
         for chunk in iter(lambda: f.read(4096), b""):
             hasher.update(chunk)
     return hasher.hexdigest()
+
+
+def copy_and_hash_file(src: Path, dst: Path) -> str:
+    """Copy src to dst like shutil.copy2 and return the MD5 hash of src.
+
+    The source is read once and each chunk is both hashed and written,
+    instead of copying the file and then reading it again to hash it.
+    """
+    hasher = hashlib.md5()
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        while chunk := fsrc.read(_COPY_CHUNK_SIZE):
+            hasher.update(chunk)
+            fdst.write(chunk)
+    shutil.copystat(src, dst)
+    return hasher.hexdigest()
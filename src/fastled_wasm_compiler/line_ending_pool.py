@@ -7,17 +7,94 @@ and copying files with proper handling of text/binary files and graceful shutdow
 
 import _thread
 import atexit
+import hashlib
 import logging
 import multiprocessing as mp
 import queue
+import re
 import threading
+import time
 import uuid
+from collections import OrderedDict
 from concurrent.futures import Future
 from pathlib import Path
 
 # Create logger for this module
 logger: logging.Logger = logging.getLogger(__name__)
 
+# A carriage return that is not followed by a line feed (old Mac line ending)
+_BARE_CR_RE: re.Pattern[bytes] = re.compile(b"\r(?!\n)")
+
+# Files modified this recently may still change without a visible mtime or
+# size change (coarse timestamps), so their digest is not cached
+_RACY_WINDOW_NS: int = 2_000_000_000
+# Bound on the digest cache; entries are small, so it holds a full FastLED tree
+_MAX_CACHE_ENTRIES: int = 16384
+# (path, mtime_ns, size) -> digest of the normalized content, least recently
+# used first. Only digests are kept, never file contents.
+_NORMALIZED_DIGEST_CACHE: "OrderedDict[tuple[str, int, int], bytes]" = OrderedDict()
+
+
+def _is_binary(data: bytes) -> bool:
+    """Check if data is binary by looking for null bytes and control characters."""
+    if b"\x00" in data:
+        return True
+    # Check for high ratio of control characters (excluding common ones like \r, \n, \t)
+    if len(data) > 0:
+        control_chars: int = sum(1 for b in data if b < 32 and b not in (9, 10, 13))
+        return control_chars / len(data) > 0.1
+    return False
+
+
+def _normalize_line_endings(src_bytes: bytes) -> bytes:
+    """Convert CRLF line endings to LF for text data, leaving binary data untouched.
+
+    Returns src_bytes itself (not a copy) when no conversion is needed.
+    """
+    # Nothing to convert; decoding and re-encoding would reproduce the input
+    if b"\r\n" not in src_bytes:
+        return src_bytes
+    # Try to decode as text, but use better binary detection
+    if _is_binary(src_bytes):
+        return src_bytes
+    try:
+        src_bytes.decode("utf-8")
+    except UnicodeDecodeError:
+        return src_bytes
+    # CR and LF bytes never occur inside a UTF-8 multi-byte sequence, so the
+    # conversion can work on the raw bytes. When every CR is part of a CRLF,
+    # deleting all CRs is a single tight pass that is cheaper than replace().
+    if _BARE_CR_RE.search(src_bytes) is None:
+        return src_bytes.translate(None, b"\r")
+    return src_bytes.replace(b"\r\n", b"\n")
+
+
+def _digest(data: bytes) -> bytes:
+    """Hash file content for the normalized digest cache."""
+    return hashlib.blake2b(data, digest_size=16).digest()
+
+
+def _cached_normalized_digest(key: tuple[str, int, int]) -> bytes | None:
+    """Return the cached digest of the normalized source at key, if any."""
+    digest = _NORMALIZED_DIGEST_CACHE.get(key)
+    if digest is not None:
+        _NORMALIZED_DIGEST_CACHE.move_to_end(key)
+    return digest
+
+
+def _remember_normalized_digest(key: tuple[str, int, int], final_bytes: bytes) -> None:
+    """Cache the digest of a normalized source keyed on (path, mtime_ns, size).
+
+    Sources modified within the last _RACY_WINDOW_NS are not cached, and the
+    least recently used entry is evicted once the cache is full.
+    """
+    if time.time_ns() - key[1] <= _RACY_WINDOW_NS:
+        return
+    _NORMALIZED_DIGEST_CACHE[key] = _digest(final_bytes)
+    _NORMALIZED_DIGEST_CACHE.move_to_end(key)
+    if len(_NORMALIZED_DIGEST_CACHE) > _MAX_CACHE_ENTRIES:
+        _NORMALIZED_DIGEST_CACHE.popitem(last=False)
+
 
 def _line_ending_worker(
     src_path_str: str, dst_path_str: str, dryrun: bool = False
@@ -82,52 +159,6 @@ def _line_ending_worker(
         if not src_path.is_file():
             return OSError(f"Source path is not a file: {src_path}")
 
-        # Read source file with better error handling
-        try:
-            src_bytes: bytes = src_path.read_bytes()
-        except FileNotFoundError:
-            return FileNotFoundError(
-                f"Source file was deleted during processing: {src_path}"
-            )
-        except PermissionError as e:
-            return PermissionError(
-                f"Permission denied reading source file {src_path}: {e}"
-            )
-        except OSError as e:
-            return OSError(f"Error reading source file {src_path}: {e}")
-
-        # Improved binary file detection
-        def is_binary(data: bytes) -> bool:
-            """Check if data is binary by looking for null bytes and control characters."""
-            if b"\x00" in data:
-                return True
-            # Check for high ratio of control characters (excluding common ones like \r, \n, \t)
-            if len(data) > 0:
-                control_chars: int = sum(
-                    1 for b in data if b < 32 and b not in (9, 10, 13)
-                )
-                return control_chars / len(data) > 0.1
-            return False
-
-        # Try to decode as text, but use better binary detection
-        src_text: str | None = None
-        is_text_file: bool = True
-
-        if is_binary(src_bytes):
-            is_text_file = False
-        else:
-            try:
-                src_text = src_bytes.decode("utf-8")
-            except UnicodeDecodeError:
-                is_text_file = False
-
-        # Convert line endings if it's a text file
-        if is_text_file and src_text is not None:
-            converted_text: str = src_text.replace("\r\n", "\n")
-            final_bytes: bytes = converted_text.encode("utf-8")
-        else:
-            final_bytes = src_bytes
-
         # Check if destination exists and compare (with error handling)
         dst_exists: bool = False
         dst_bytes: bytes | None = None
@@ -149,26 +180,45 @@ def _line_ending_worker(
         except OSError as e:
             return OSError(f"Error reading destination file {dst_path}: {e}")
 
-        # Get source file modification time for timestamp comparison
         try:
-            src_mtime = src_path.stat().st_mtime
+            src_stat = src_path.stat()
+            # Source file modification time for timestamp comparison
+            src_mtime = src_stat.st_mtime
             # Log source timestamp read
             from fastled_wasm_compiler.timestamp_utils import _log_timestamp_operation
 
             _log_timestamp_operation("READ", str(src_path), src_mtime)
+
+            # Destination is not older than the source (for build system
+            # integration, a newer source is always rewritten to update timestamps)
+            dst_is_current = (
+                dst_exists and dst_bytes is not None and src_mtime <= dst_mtime
+            )
+            src_key = (src_path_str, src_stat.st_mtime_ns, src_stat.st_size)
+            if dst_is_current and dst_bytes is not None:
+                cached_digest = _cached_normalized_digest(src_key)
+                if cached_digest is not None and cached_digest == _digest(dst_bytes):
+                    # Unchanged source already synced - skip reading it again
+                    return False
+
+            # Read and normalize the source file
+            final_bytes: bytes = _normalize_line_endings(src_path.read_bytes())
+            _remember_normalized_digest(src_key, final_bytes)
+        except FileNotFoundError:
+            return FileNotFoundError(
+                f"Source file was deleted during processing: {src_path}"
+            )
+        except PermissionError as e:
+            return PermissionError(
+                f"Permission denied reading source file {src_path}: {e}"
+            )
         except OSError as e:
-            return OSError(f"Error getting source file timestamp {src_path}: {e}")
-
-        # Compare content AND timestamps if destination exists
-        if dst_exists and dst_bytes is not None:
-            # Check if source file is newer than destination (for build system integration)
-            if src_mtime > dst_mtime:
-                # Source is newer - always update to preserve timestamps for build system
-                # This is critical for build flags change detection
-                pass  # Continue to file writing
-            elif final_bytes == dst_bytes:
-                # Content is same and destination is not older - no update needed
-                return False  # Files are the same, no update needed
+            return OSError(f"Error reading source file {src_path}: {e}")
+
+        # Compare content if the destination is not older than the source
+        if dst_is_current and final_bytes == dst_bytes:
+            # Content is same and destination is not older - no update needed
+            return False  # Files are the same, no update needed
 
         # Files are different or destination doesn't exist
         # In dryrun mode, just report that files would change without writing
@@ -183,6 +233,7 @@ def _line_ending_worker(
             # Write the file atomically by writing to a temp file first
             temp_path: Path = dst_path.with_suffix(dst_path.suffix + ".tmp")
             try:
+                # Write the bytes that were compared, never a fresh read of src
                 temp_path.write_bytes(final_bytes)
                 # Atomic move (on most filesystems)
                 temp_path.replace(dst_path)
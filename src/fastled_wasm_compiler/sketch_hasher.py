@@ -4,13 +4,15 @@ Source files like ino,cpp,h,hpp are concatenated and preprocessed with GCC.
 Data date files are hashed as is.
 """
 
-__all__ = ["generate_hash_of_project_files"]
+__all__ = ["clear_digest_cache", "generate_hash_of_project_files"]
 
 import hashlib
 import os
 import re
 import subprocess
+import time
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from tempfile import TemporaryDirectory
@@ -18,6 +20,21 @@ from tempfile import TemporaryDirectory
 _SOURCE_EXTENSIONS = [".cpp", ".hpp", ".h", ".ino"]
 _HEADER_INCLUDE_PATTERN = re.compile(r'#include\s*(["<].*?[">])')
 
+# Files modified this recently may still change without a visible mtime bump,
+# so their digests are not cached.
+_RACY_WINDOW_NS = 2_000_000_000
+# Bound on each cache so a long running server does not grow without limit
+_MAX_CACHE_ENTRIES = 4096
+# Files are hashed in chunks of this size instead of being read whole
+_READ_CHUNK_SIZE = 1 << 20
+# Below this many files, thread pool startup costs more than it saves
+_PARALLEL_HASH_THRESHOLD = 8
+
+# (path, mtime_ns, size) -> content digest of that file
+_FILE_DIGEST_CACHE: dict[tuple[str, int, int], str] = {}
+# ((path, content digest), ...) of the source files -> preprocessed source hash
+_SRC_HASH_CACHE: dict[tuple[tuple[str, str], ...], str] = {}
+
 
 @dataclass
 class ProjectFiles:
@@ -38,8 +55,51 @@ def _testing_verbose() -> bool:
     return os.environ.get("TESTING_VERBOSE", "0") == "1"
 
 
+def _new_hash() -> hashlib.blake2b:
+    # blake2b is faster than md5 or sha256 on 64 bit CPUs
+    return hashlib.blake2b(digest_size=16)
+
+
 def hash_string(s: str) -> str:
-    return hashlib.md5(s.encode()).hexdigest()
+    hash_object = _new_hash()
+    hash_object.update(s.encode())
+    return hash_object.hexdigest()
+
+
+def clear_digest_cache() -> None:
+    """Forget all cached file and source hashes."""
+    _FILE_DIGEST_CACHE.clear()
+    _SRC_HASH_CACHE.clear()
+
+
+def _file_digest(file: Path) -> str:
+    """Hash the contents of a file, reusing the digest while it is unchanged."""
+    st = file.stat()
+    key = (str(file.absolute()), st.st_mtime_ns, st.st_size)
+    digest = _FILE_DIGEST_CACHE.get(key)
+    if digest is None:
+        hash_object = _new_hash()
+        with open(file, "rb") as f:
+            while chunk := f.read(_READ_CHUNK_SIZE):
+                hash_object.update(chunk)
+        digest = hash_object.hexdigest()
+        if time.time_ns() - st.st_mtime_ns > _RACY_WINDOW_NS:
+            if len(_FILE_DIGEST_CACHE) >= _MAX_CACHE_ENTRIES:
+                _FILE_DIGEST_CACHE.clear()
+            _FILE_DIGEST_CACHE[key] = digest
+    return digest
+
+
+def _file_digests(files: list[Path]) -> list[str]:
+    """Digest files in order, on a thread pool when there are enough of them.
+
+    hashlib releases the GIL while hashing, so reads and hashing overlap.
+    """
+    if len(files) < _PARALLEL_HASH_THRESHOLD:
+        return [_file_digest(file) for file in files]
+    max_workers = min(len(files), 32, (os.cpu_count() or 1) * 4)
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(_file_digest, files))
 
 
 def is_source_file(filename: str, src_file_extensions: list[str]) -> bool:
@@ -63,19 +123,30 @@ def collect_files(
     src_files: list[Path] = []
     other_files: list[Path] = []
 
-    for root, _, filenames in os.walk(str(directory)):
-        for filename in filenames:
-            print(f"Checking file: {filename}")
-            file_path = Path(os.path.join(root, filename))
+    # scandir reports each entry's type from the directory listing itself, so
+    # telling files from directories needs no extra stat call per entry.
+    pending_dirs = [str(directory)]
+    while pending_dirs:
+        with os.scandir(pending_dirs.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir():
+                    # Like os.walk, do not descend into symlinked directories
+                    if not entry.is_symlink():
+                        pending_dirs.append(entry.path)
+                    continue
+                filename = entry.name
+                print(f"Checking file: {filename}")
+                file_path = Path(entry.path)
 
-            if is_source_file(filename, src_file_extensions):
-                print("Found source file:", file_path)
-                src_files.append(file_path)
-            else:
-                print("Found non source file:", file_path)
-                other_files.append(file_path)
+                if is_source_file(filename, src_file_extensions):
+                    print("Found source file:", file_path)
+                    src_files.append(file_path)
+                else:
+                    print("Found non source file:", file_path)
+                    other_files.append(file_path)
 
-    return ProjectFiles(src_files=src_files, other_files=other_files)
+    # Sorted so the hash does not depend on directory listing order
+    return ProjectFiles(src_files=sorted(src_files), other_files=sorted(other_files))
 
 
 def concatenate_files(file_list: list[Path], output_file: Path) -> None:
@@ -255,6 +326,12 @@ def generate_hash_of_src_files(src_files: list[Path]) -> SrcFileHashResult:
         SrcFileHashResult: Object containing hash, stdout and error status.
     """
     try:
+        # Preprocessing is the expensive part, so skip it when no source changed
+        src_key = tuple(zip(map(str, src_files), _file_digests(src_files), strict=True))
+        cached_hash = _SRC_HASH_CACHE.get(src_key)
+        if cached_hash is not None:
+            return SrcFileHashResult(hash=cached_hash, stdout="", error=False)
+
         with TemporaryDirectory() as temp_dir:
             temp_file = Path(temp_dir) / "concatenated_output.cpp"
             preprocessed_file = Path(temp_dir) / "preprocessed_output.cpp"
@@ -273,8 +350,12 @@ def generate_hash_of_src_files(src_files: list[Path]) -> SrcFileHashResult:
                     out_lines.append(line)
 
             contents = "\n".join(out_lines)
+            src_hash = hash_string(contents)
+            if len(_SRC_HASH_CACHE) >= _MAX_CACHE_ENTRIES:
+                _SRC_HASH_CACHE.clear()
+            _SRC_HASH_CACHE[src_key] = src_hash
             return SrcFileHashResult(
-                hash=hash_string(contents),
+                hash=src_hash,
                 stdout="",  # No stdout in success case
                 error=False,
             )
@@ -300,10 +381,9 @@ def generate_hash_of_project_files(root_dir: Path) -> str:
     if src_result.error:
         raise Exception(f"Error hashing source files: {src_result.stdout}")
 
-    other_files = project_files.other_files
     # for all other files, don't pre-process them, just hash them
-    hash_object = hashlib.md5()
-    for file in other_files:
-        hash_object.update(file.read_bytes())
+    hash_object = _new_hash()
+    for digest in _file_digests(project_files.other_files):
+        hash_object.update(digest.encode())
     other_files_hash = hash_object.hexdigest()
     return hash_string(src_result.hash + other_files_hash)
@@ -1,5 +1,8 @@
+import fnmatch
 import logging
+import re
 import subprocess
+import sys
 import time
 from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
@@ -77,6 +80,21 @@ ASSET_ONLY_EXTENSIONS = [
 ]
 
 
+def _compile_globs(patterns: list[str]) -> re.Pattern[str]:
+    """Compile filename globs into a single regex matched against a file name.
+
+    Mirrors Path.match for single-component patterns, including its case
+    insensitivity on Windows, but is translated once at import time.
+    """
+    flags = re.IGNORECASE if sys.platform == "win32" else 0
+    return re.compile("|".join(fnmatch.translate(p) for p in patterns), flags)
+
+
+_ALLOWED_RE = _compile_globs(ALLOWED_EXTENSIONS)
+_LIBRARY_AFFECTING_RE = _compile_globs(LIBRARY_AFFECTING_EXTENSIONS)
+_ASSET_ONLY_RE = _compile_globs(ASSET_ONLY_EXTENSIONS)
+
+
 @dataclass
 class SyncResult:
     """Result from sync operation with file classification."""
@@ -92,18 +110,12 @@ class SyncResult:
 
 def _is_library_affecting_file(file_path: Path) -> bool:
     """Check if a file change should trigger library rebuild."""
-    for pattern in LIBRARY_AFFECTING_EXTENSIONS:
-        if file_path.match(pattern):
-            return True
-    return False
+    return _LIBRARY_AFFECTING_RE.match(file_path.name) is not None
 
 
 def _is_asset_only_file(file_path: Path) -> bool:
     """Check if a file is an asset that doesn't affect library compilation."""
-    for pattern in ASSET_ONLY_EXTENSIONS:
-        if file_path.match(pattern):
-            return True
-    return False
+    return _ASSET_ONLY_RE.match(file_path.name) is not None
 
 
 def _is_under(rel_path: Path, prefix: Path) -> bool:
@@ -122,8 +134,6 @@ def _find_files_with_extensions(src_dir: Path) -> list[Path]:
 
     # On Windows, the find command from Git bash has issues with complex path expressions
     # and Windows-style paths, so we use the Python fallback instead
-    import sys
-
     if sys.platform == "win32":
         return _find_files_python_fallback(src_dir)
 
@@ -399,12 +409,9 @@ def _find_files_python_fallback(src_dir: Path) -> list[Path]:
     """Fallback Python implementation when find command is not available."""
     files = []
     for file_path in src_dir.rglob("*"):
-        if file_path.is_file():
-            # Check if file matches any allowed extension
-            for pattern in ALLOWED_EXTENSIONS:
-                if file_path.match(pattern):
-                    files.append(file_path)
-                    break
+        # Check if file matches any allowed extension
+        if file_path.is_file() and _ALLOWED_RE.match(file_path.name):
+            files.append(file_path)
     return files
 
 
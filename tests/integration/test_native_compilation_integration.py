@@ -3,6 +3,13 @@ Integration tests for Native EMSDK Compilation
 
 These tests require actual EMSDK installation and are expensive.
 They should only be run when explicitly needed.
+
+When ccache is installed, emcc runs through it. EmsdkManager points
+CCACHE_DIR at ~/.fastled-ccache. Emscripten's system libraries are built
+into the EMSDK's own cache unless FASTLED_TEST_EM_CACHE names another
+EM_CACHE directory to reuse between runs. CI jobs that run these tests
+should cache those directories between runs (e.g. with actions/cache),
+keyed on the EMSDK version.
 """
 
 import os
@@ -10,32 +17,19 @@ import shutil
 import tempfile
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 from fastled_wasm_compiler.compile_sketch_native import (
     NativeCompilerImpl,
     compile_sketch_native,
 )
-from fastled_wasm_compiler.emsdk_manager import EmsdkManager
 
+_RUN_INTEGRATION_TESTS = bool(os.environ.get("RUN_INTEGRATION_TESTS"))
+# Opt-in EM_CACHE dir for emscripten's system libraries; unset uses the EMSDK's
+_EM_CACHE_ENV = "FASTLED_TEST_EM_CACHE"
 
-class TestNativeCompilerIntegration(unittest.TestCase):
-    """Integration tests for NativeCompiler that require EMSDK installation."""
-
-    @classmethod
-    def setUpClass(cls):
-        """Set up shared cache for all integration tests."""
-        # Use a persistent cache directory to speed up multiple test runs
-        cls.shared_cache_dir = Path.cwd() / ".cache" / "test-emsdk-binaries"
-        cls.shared_cache_dir.mkdir(parents=True, exist_ok=True)
-
-    def setUp(self):
-        """Set up integration test environment."""
-        self.temp_dir = Path(tempfile.mkdtemp())
-        self.sketch_dir = self.temp_dir / "sketch"
-        self.sketch_dir.mkdir()
-
-        # Create a simple test sketch
-        sketch_content = """
+# A simple test sketch
+_SKETCH_INO = b"""
 #include "FastLED.h"
 
 #define NUM_LEDS 10
@@ -53,23 +47,56 @@ void loop() {
     delay(100);
 }
 """
-        (self.sketch_dir / "sketch.ino").write_text(sketch_content)
 
-        # Set up EMSDK manager with shared cache
-        self.emsdk_dir = self.temp_dir / "emsdk"
-        self.emsdk_manager = EmsdkManager(
-            install_dir=self.emsdk_dir, cache_dir=self.shared_cache_dir
-        )
 
-        # Skip if integration tests not enabled
-        if not os.environ.get("RUN_INTEGRATION_TESTS"):
-            self.skipTest("Integration tests not enabled. Set RUN_INTEGRATION_TESTS=1")
+@unittest.skipUnless(
+    _RUN_INTEGRATION_TESTS,
+    "Integration tests not enabled. Set RUN_INTEGRATION_TESTS=1",
+)
+class TestNativeCompilerIntegration(unittest.TestCase):
+    """Integration tests for NativeCompiler that require EMSDK installation."""
+
+    @classmethod
+    def setUpClass(cls):
+        """Write the test sketch once for all integration tests."""
+        # Each test hardlinks the sketch into its own sketch dir
+        cls._root = Path(tempfile.mkdtemp())
+        cls._shared_ino = cls._root / "sketch.ino"
+        cls._shared_ino.write_bytes(_SKETCH_INO)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared sketch."""
+        shutil.rmtree(cls._root, ignore_errors=True)
+
+    def setUp(self):
+        """Set up integration test environment."""
+        # Route emcc through ccache so repeated runs reuse compiled objects.
+        # Environment changes are undone after each test.
+        env_patcher = patch.dict(os.environ)
+        env_patcher.start()
+        self.addCleanup(env_patcher.stop)
+        if shutil.which("ccache"):
+            os.environ.setdefault("EM_COMPILER_WRAPPER", "ccache")
+        # Optionally keep the system libraries emscripten builds on first use
+        # outside the per-test EMSDK install so later runs reuse them.
+        em_cache_dir = os.environ.get(_EM_CACHE_ENV)
+        if em_cache_dir:
+            os.environ["EM_CACHE"] = em_cache_dir
+
+        self.temp_dir = Path(tempfile.mkdtemp(dir=self._root))
+        self.sketch_dir = self.temp_dir / "sketch"
+        self.sketch_dir.mkdir()
+
+        # Link the shared sketch in instead of writing it for every test
+        os.link(self._shared_ino, self.sketch_dir / "sketch.ino")
+
+        self.emsdk_dir = self.temp_dir / "emsdk"
 
     def tearDown(self):
         """Clean up integration test environment."""
         if self.temp_dir.exists():
             shutil.rmtree(self.temp_dir, ignore_errors=True)
-        # Note: We don't clean up shared_cache_dir to preserve downloads
 
     def test_native_compilation_smoke_test(self):
         """Test basic native compilation functionality."""
@@ -89,11 +116,12 @@ void loop() {
             self.assertTrue(result.exists())
 
             # Check that output files were created
-            output_files = list(output_dir.glob("*.js"))
-            self.assertGreater(len(output_files), 0, "No JavaScript output files found")
-
-            wasm_files = list(output_dir.glob("*.wasm"))
-            self.assertGreater(len(wasm_files), 0, "No WASM output files found")
+            self.assertIsNotNone(
+                next(output_dir.glob("*.js"), None), "No JavaScript output files found"
+            )
+            self.assertIsNotNone(
+                next(output_dir.glob("*.wasm"), None), "No WASM output files found"
+            )
 
         except Exception as e:
             # If compilation fails, provide helpful error information
@@ -116,10 +144,12 @@ void loop() {
             self.assertTrue(result.exists())
 
             # Check output files exist
-            self.assertTrue(
-                any(output_dir.glob("*.js")), "No JavaScript files generated"
+            self.assertIsNotNone(
+                next(output_dir.glob("*.js"), None), "No JavaScript files generated"
+            )
+            self.assertIsNotNone(
+                next(output_dir.glob("*.wasm"), None), "No WASM files generated"
             )
-            self.assertTrue(any(output_dir.glob("*.wasm")), "No WASM files generated")
 
         except Exception as e:
             self.fail(f"Native compilation function failed: {e}")
@@ -148,12 +178,12 @@ void loop() {
                     self.assertTrue(result.exists())
 
                     # Check output files exist
-                    self.assertTrue(
-                        any(mode_output_dir.glob("*.js")),
+                    self.assertIsNotNone(
+                        next(mode_output_dir.glob("*.js"), None),
                         f"No JavaScript files generated for {mode} mode",
                     )
-                    self.assertTrue(
-                        any(mode_output_dir.glob("*.wasm")),
+                    self.assertIsNotNone(
+                        next(mode_output_dir.glob("*.wasm"), None),
                         f"No WASM files generated for {mode} mode",
                     )
 
@@ -0,0 +1,73 @@
+"""Shared pytest configuration for the unit tests."""
+
+import os
+import shutil
+import tempfile
+from collections.abc import Iterator
+from pathlib import Path
+
+import pytest
+
+# Opt-in base directory for unit test scratch files, e.g. /dev/shm
+_TMPDIR_ENV = "FASTLED_TEST_TMPDIR"
+# Fall back to the default temp dir when the opt-in dir has less space free
+_MIN_FREE_BYTES = 256 * 1024 * 1024
+# Minimal Vite dist/ output that the compile pipeline copies into fastled_js
+_DIST_FILES = {
+    "index.html": "<html></html>",
+    "index.css": "body {}",
+    "index.js": "console.log('test');",
+}
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _tempdir_in_ram() -> Iterator[None]:
+    """Create unit test temp directories under FASTLED_TEST_TMPDIR when set.
+
+    The unit tests only check logical behaviour, so their scratch files can
+    live on a tmpfs such as /dev/shm. This is opt-in because tmpfs is often
+    small (64MB in Docker by default); the default temp dir is also kept when
+    the chosen directory has too little space free. Everything goes under a
+    per-session directory that is removed afterwards.
+    """
+    base_dir = os.environ.get(_TMPDIR_ENV)
+    if not base_dir:
+        yield
+        return
+    try:
+        free_bytes = shutil.disk_usage(base_dir).free
+    except OSError:
+        free_bytes = 0
+    if free_bytes < _MIN_FREE_BYTES:
+        yield
+        return
+
+    session_dir = tempfile.mkdtemp(prefix="fastled-unit-", dir=base_dir)
+    previous = tempfile.tempdir
+    tempfile.tempdir = session_dir
+    try:
+        yield
+    finally:
+        tempfile.tempdir = previous
+        shutil.rmtree(session_dir, ignore_errors=True)
+
+
+@pytest.fixture(scope="session")
+def asset_dist_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Create an assets dir with a Vite dist/ tree once for the whole session.
+
+    Tests only read from it, so every suite that needs assets shares one copy.
+    """
+    assets_dir = tmp_path_factory.mktemp("assets")
+    dist_dir = assets_dir / "dist"
+    dist_dir.mkdir()
+    for name, content in _DIST_FILES.items():
+        (dist_dir / name).write_text(content)
+    return assets_dir
+
+
+@pytest.fixture(scope="class")
+def shared_assets_dir(request: pytest.FixtureRequest, asset_dist_dir: Path) -> None:
+    """Expose the session assets dir to unittest classes as ``assets_dir``."""
+    assert request.cls is not None
+    request.cls.assets_dir = asset_dist_dir
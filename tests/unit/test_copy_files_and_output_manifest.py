@@ -0,0 +1,176 @@
+"""
+Unit tests for copying build output and writing the data manifest.
+"""
+
+import json
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+
+from fastled_wasm_compiler.copy_files_and_output_manifest import (
+    copy_output_files_and_create_manifest,
+    process_embedded_data_directory,
+)
+from fastled_wasm_compiler.hashfile import hash_file
+
+
+class ProcessEmbeddedDataDirectoryTester(unittest.TestCase):
+    """Tests for process_embedded_data_directory."""
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        self.addCleanup(temp_dir.cleanup)
+        self.root = Path(temp_dir.name)
+        self.input_dir = self.root / "data"
+        self.output_dir = self.root / "out" / "data"
+        self.input_dir.mkdir()
+
+    def test_missing_input_dir_returns_empty_manifest(self) -> None:
+        """Test that no manifest entries or output dir are created without data."""
+        manifest = process_embedded_data_directory(
+            self.root / "missing", self.output_dir
+        )
+        self.assertEqual(manifest, [])
+        self.assertFalse(self.output_dir.exists())
+
+    def test_empty_input_dir_clears_output(self) -> None:
+        """Test that an empty data dir removes old copies and creates nothing."""
+        manifest = process_embedded_data_directory(self.input_dir, self.output_dir)
+        self.assertEqual(manifest, [])
+        self.assertFalse(self.output_dir.exists())
+
+        # Files copied by an earlier build are still removed
+        self.output_dir.mkdir(parents=True)
+        (self.output_dir / "stale.dat").write_bytes(b"stale")
+        manifest = process_embedded_data_directory(self.input_dir, self.output_dir)
+        self.assertEqual(manifest, [])
+        self.assertEqual(list(self.output_dir.iterdir()), [])
+
+    def test_files_are_copied_and_listed(self) -> None:
+        """Test copied and embedded files in the manifest and output dir."""
+        (self.input_dir / "video.dat").write_bytes(b"\x00\x01" * 100)
+        (self.input_dir / "audio.mp3.embedded.json").write_text(
+            json.dumps({"hash": "abc123", "size": 4096})
+        )
+        (self.input_dir / "subdir").mkdir()
+        self.output_dir.mkdir(parents=True)
+        (self.output_dir / "stale.dat").write_bytes(b"stale")
+
+        manifest = process_embedded_data_directory(self.input_dir, self.output_dir)
+
+        entries = {entry["name"]: entry for entry in manifest}
+        self.assertEqual(
+            entries,
+            {
+                "video.dat": {
+                    "name": "video.dat",
+                    "path": "data/video.dat",
+                    "size": 200,
+                    "hash": hash_file(self.input_dir / "video.dat"),
+                },
+                "audio.mp3": {
+                    "name": "audio.mp3",
+                    "path": "data/audio.mp3",
+                    "size": 4096,
+                    "hash": "abc123",
+                },
+            },
+        )
+        # Only real data files are copied; stale output files are removed
+        self.assertEqual(
+            sorted(p.name for p in self.output_dir.iterdir()), ["video.dat"]
+        )
+        self.assertEqual(
+            (self.output_dir / "video.dat").read_bytes(), b"\x00\x01" * 100
+        )
+        # Copies keep the source metadata, like shutil.copy2
+        self.assertEqual(
+            (self.output_dir / "video.dat").stat().st_mtime_ns,
+            (self.input_dir / "video.dat").stat().st_mtime_ns,
+        )
+
+
+class CopyOutputFilesTester(unittest.TestCase):
+    """Tests for copy_output_files_and_create_manifest."""
+
+    def setUp(self) -> None:
+        temp_dir = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        self.addCleanup(temp_dir.cleanup)
+        root = Path(temp_dir.name)
+        self.build_dir = root / "build"
+        self.src_dir = root / "sketch"
+        self.assets_dir = root / "assets"
+        self.build_dir.mkdir()
+        self.src_dir.mkdir()
+        (self.build_dir / "fastled.js").write_text("// js")
+        (self.build_dir / "fastled.wasm").write_bytes(b"\x00asm")
+        (self.build_dir / "other.o").write_bytes(b"obj")
+        dist_assets = self.assets_dir / "dist" / "assets"
+        dist_assets.mkdir(parents=True)
+        (self.assets_dir / "dist" / "index.html").write_text("<html></html>")
+        (dist_assets / "index-abc.js").write_text("// chunk")
+
+    def _copy(self) -> Path:
+        copy_output_files_and_create_manifest(
+            build_dir=self.build_dir,
+            src_dir=self.src_dir,
+            fastled_js_out="fastled_js",
+            assets_dir=self.assets_dir,
+        )
+        return self.src_dir / "fastled_js"
+
+    def test_build_artifacts_and_dist_are_copied(self) -> None:
+        """Test that fastled.* artifacts and the whole dist/ tree are copied."""
+        out_dir = self._copy()
+        self.assertEqual(
+            sorted(p.relative_to(out_dir).as_posix() for p in out_dir.rglob("*")),
+            [
+                "assets",
+                "assets/index-abc.js",
+                "fastled.js",
+                "fastled.wasm",
+                "files.json",
+                "index.html",
+            ],
+        )
+        self.assertEqual((out_dir / "assets" / "index-abc.js").read_text(), "// chunk")
+        self.assertEqual(json.loads((out_dir / "files.json").read_text()), [])
+
+    def test_dist_overwrites_build_artifact_with_same_name(self) -> None:
+        """Test that dist/ is copied after the build artifacts and wins clashes."""
+        (self.assets_dir / "dist" / "fastled.js").write_text("// from dist")
+        out_dir = self._copy()
+        self.assertEqual((out_dir / "fastled.js").read_text(), "// from dist")
+
+    def test_stale_dist_files_are_removed(self) -> None:
+        """Test that recopying dist/ drops files a new Vite build no longer has."""
+        out_dir = self._copy()
+        dist_assets = self.assets_dir / "dist" / "assets"
+        (dist_assets / "index-abc.js").unlink()
+        (dist_assets / "index-def.js").write_text("// new chunk")
+        (dist_assets / "fonts").mkdir()
+        (dist_assets / "fonts" / "a.woff").write_bytes(b"font")
+
+        self._copy()
+
+        self.assertEqual(
+            sorted(
+                p.relative_to(out_dir).as_posix()
+                for p in (out_dir / "assets").rglob("*")
+            ),
+            ["assets/fonts", "assets/fonts/a.woff", "assets/index-def.js"],
+        )
+        self.assertEqual(
+            (out_dir / "assets" / "index-def.js").read_text(), "// new chunk"
+        )
+
+    def test_missing_dist_raises(self) -> None:
+        """Test that a missing Vite build is reported as an error."""
+        shutil.rmtree(self.assets_dir / "dist")
+        with self.assertRaises(RuntimeError):
+            self._copy()
+
+
+if __name__ == "__main__":
+    unittest.main()
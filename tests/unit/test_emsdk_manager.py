@@ -10,11 +10,14 @@ These tests validate:
 - Basic compilation functionality
 """
 
+import os
 import platform
 import shutil
+import subprocess
 import tempfile
 import unittest
 from pathlib import Path
+from typing import Any
 from unittest.mock import Mock, patch
 
 from fastled_wasm_compiler.emsdk_manager import (
@@ -23,6 +26,8 @@ from fastled_wasm_compiler.emsdk_manager import (
     get_emsdk_manager,
 )
 
+_EMSDK_TOOLS = ("emcc", "em++", "emar", "emranlib")
+
 
 class TestEmsdkPlatform(unittest.TestCase):
     """Test EmsdkPlatform data class."""
@@ -39,6 +44,45 @@ class TestEmsdkPlatform(unittest.TestCase):
         self.assertEqual(platform_info.platform_name, "ubuntu")
 
 
+class TestEmsdkPlatformDetection(unittest.TestCase):
+    """Test platform detection without constructing an EmsdkManager."""
+
+    def test_platform_detection(self):
+        """Test platform detection for each supported system/machine pair."""
+        cases = [
+            ("Linux", "x86_64", "ubuntu-latest", "Ubuntu Linux", "emsdk-ubuntu-latest"),
+            ("Linux", "amd64", "ubuntu-latest", "Ubuntu Linux", "emsdk-ubuntu-latest"),
+            (
+                "Darwin",
+                "arm64",
+                "macos-arm64",
+                "macOS Apple Silicon",
+                "emsdk-macos-arm64",
+            ),
+            ("Darwin", "x86_64", "macos-x86_64", "macOS Intel", "emsdk-macos-x86_64"),
+            ("Windows", "AMD64", "windows-latest", "Windows", "emsdk-windows-latest"),
+        ]
+        for system, machine, name, display_name, archive_pattern in cases:
+            with self.subTest(system=system, machine=machine):
+                platform_info = EmsdkManager.detect_platform_info(system, machine)
+
+                self.assertEqual(
+                    (
+                        platform_info.name,
+                        platform_info.display_name,
+                        platform_info.archive_pattern,
+                    ),
+                    (name, display_name, archive_pattern),
+                )
+
+    def test_platform_detection_unsupported(self):
+        """Test platform detection for unsupported platform."""
+        with self.assertRaises(RuntimeError) as cm:
+            EmsdkManager.detect_platform_info("FreeBSD", "x86_64")
+
+        self.assertIn("Unsupported platform FreeBSD-x86_64", str(cm.exception))
+
+
 class TestEmsdkManager(unittest.TestCase):
     """Test EMSDK Manager functionality."""
 
@@ -53,73 +97,17 @@ class TestEmsdkManager(unittest.TestCase):
         if self.temp_dir.exists():
             shutil.rmtree(self.temp_dir, ignore_errors=True)
 
-    def test_platform_detection_linux(self):
-        """Test platform detection for Linux."""
+    def test_platform_info_uses_host_platform(self):
+        """Test that the manager detects the platform it is constructed on."""
         with (
             patch("platform.system", return_value="Linux"),
             patch("platform.machine", return_value="x86_64"),
         ):
-
-            manager = EmsdkManager(install_dir=self.temp_dir)
-            platform_info = manager.platform_info
-
-            self.assertEqual(platform_info.name, "ubuntu-latest")
-            self.assertEqual(platform_info.display_name, "Ubuntu Linux")
-            self.assertEqual(platform_info.archive_pattern, "emsdk-ubuntu-latest")
-
-    def test_platform_detection_macos_arm(self):
-        """Test platform detection for macOS ARM."""
-        with (
-            patch("platform.system", return_value="Darwin"),
-            patch("platform.machine", return_value="arm64"),
-        ):
-
-            manager = EmsdkManager(install_dir=self.temp_dir)
-            platform_info = manager.platform_info
-
-            self.assertEqual(platform_info.name, "macos-arm64")
-            self.assertEqual(platform_info.display_name, "macOS Apple Silicon")
-            self.assertEqual(platform_info.archive_pattern, "emsdk-macos-arm64")
-
-    def test_platform_detection_macos_intel(self):
-        """Test platform detection for macOS Intel."""
-        with (
-            patch("platform.system", return_value="Darwin"),
-            patch("platform.machine", return_value="x86_64"),
-        ):
-
-            manager = EmsdkManager(install_dir=self.temp_dir)
-            platform_info = manager.platform_info
-
-            self.assertEqual(platform_info.name, "macos-x86_64")
-            self.assertEqual(platform_info.display_name, "macOS Intel")
-            self.assertEqual(platform_info.archive_pattern, "emsdk-macos-x86_64")
-
-    def test_platform_detection_windows(self):
-        """Test platform detection for Windows."""
-        with (
-            patch("platform.system", return_value="Windows"),
-            patch("platform.machine", return_value="AMD64"),
-        ):
-
             manager = EmsdkManager(install_dir=self.temp_dir)
-            platform_info = manager.platform_info
-
-            self.assertEqual(platform_info.name, "windows-latest")
-            self.assertEqual(platform_info.display_name, "Windows")
-            self.assertEqual(platform_info.archive_pattern, "emsdk-windows-latest")
-
-    def test_platform_detection_unsupported(self):
-        """Test platform detection for unsupported platform."""
-        with (
-            patch("platform.system", return_value="FreeBSD"),
-            patch("platform.machine", return_value="x86_64"),
-        ):
-
-            with self.assertRaises(RuntimeError) as cm:
-                EmsdkManager(install_dir=self.temp_dir)
 
-            self.assertIn("Unsupported platform FreeBSD-x86_64", str(cm.exception))
+        self.assertIs(
+            manager.platform_info, EmsdkManager.PLATFORMS[("Linux", "x86_64")]
+        )
 
     def test_is_installed_false_missing_dir(self):
         """Test is_installed returns False when directory doesn't exist."""
@@ -186,12 +174,41 @@ class TestEmsdkManager(unittest.TestCase):
 
     def test_reconstruct_archive_with_script(self):
         """Test archive reconstruction using provided script."""
-        # Skip this test on Windows due to bash script execution issues
-        if platform.system() == "Windows":
-            self.skipTest(
-                "Bash script execution not reliable on Windows in test environment"
-            )
+        download_dir = self.temp_dir / "download"
+        download_dir.mkdir()
 
+        base_pattern = "emsdk-test"
+        expected_path = download_dir / f"{base_pattern}.tar.xz"
+        script_path = download_dir / f"{base_pattern}-reconstruct.sh"
+        script_path.write_text(
+            f"cat {base_pattern}.tar.xz.part* > {base_pattern}.tar.xz"
+        )
+
+        # Simulate the script's effect instead of forking a shell
+        def fake_run(
+            cmd: list[str], *args: Any, **kwargs: Any
+        ) -> subprocess.CompletedProcess[str]:
+            expected_path.write_bytes(b"part1contentpart2content")
+            return subprocess.CompletedProcess(cmd, 0, stdout="", stderr="")
+
+        with patch(
+            "fastled_wasm_compiler.emsdk_manager.subprocess.run",
+            side_effect=fake_run,
+        ) as mock_run:
+            result = self.manager._reconstruct_archive(download_dir, base_pattern)
+
+        # Check result
+        mock_run.assert_called_once()
+        self.assertEqual(mock_run.call_args[0][0][-1], str(script_path))
+        self.assertEqual(result, expected_path)
+        self.assertEqual(expected_path.read_bytes(), b"part1contentpart2content")
+
+    @unittest.skipIf(
+        platform.system() == "Windows" or not shutil.which("sh"),
+        "Requires a POSIX shell to execute the reconstruction script",
+    )
+    def test_reconstruct_archive_with_real_script(self):
+        """Test archive reconstruction by actually running the script."""
         download_dir = self.temp_dir / "download"
         download_dir.mkdir()
 
@@ -202,9 +219,10 @@ class TestEmsdkManager(unittest.TestCase):
         part1.write_bytes(b"part1content")
         part2.write_bytes(b"part2content")
 
-        # Create a mock reconstruction script
-        script_path = download_dir / "reconstruct.sh"
-        script_path.write_text("cat *.part* > emsdk-test.tar.xz")
+        script_path = download_dir / f"{base_pattern}-reconstruct.sh"
+        script_path.write_text(
+            f"#!/bin/sh\ncat {base_pattern}.tar.xz.part* > {base_pattern}.tar.xz\n"
+        )
 
         # Reconstruct
         result = self.manager._reconstruct_archive(download_dir, base_pattern)
@@ -212,7 +230,6 @@ class TestEmsdkManager(unittest.TestCase):
         # Check result
         expected_path = download_dir / f"{base_pattern}.tar.xz"
         self.assertEqual(result, expected_path)
-        self.assertTrue(expected_path.exists())
         self.assertEqual(expected_path.read_bytes(), b"part1contentpart2content")
 
     def test_get_tool_paths_not_installed(self):
@@ -231,10 +248,10 @@ class TestEmsdkManager(unittest.TestCase):
             tool_paths = self.manager.get_tool_paths()
 
             # Check that all expected tools are present
-            expected_tools = ["emcc", "em++", "emar", "emranlib"]
-            for tool in expected_tools:
+            names = self._list_upstream_dir()
+            for tool in _EMSDK_TOOLS:
                 self.assertIn(tool, tool_paths)
-                self.assertTrue(tool_paths[tool].exists())
+                self.assertIn(tool_paths[tool].name, names)
 
     def test_get_tool_paths_windows_extensions(self):
         """Test get_tool_paths on Windows with .bat extensions."""
@@ -245,10 +262,10 @@ class TestEmsdkManager(unittest.TestCase):
             tool_paths = self.manager.get_tool_paths()
 
             # Check that all expected tools are present with .bat extensions
-            expected_tools = ["emcc", "em++", "emar", "emranlib"]
-            for tool in expected_tools:
+            names = self._list_upstream_dir()
+            for tool in _EMSDK_TOOLS:
                 self.assertIn(tool, tool_paths)
-                self.assertTrue(tool_paths[tool].exists())
+                self.assertIn(tool_paths[tool].name, names)
                 self.assertTrue(tool_paths[tool].name.endswith(".bat"))
 
     def test_get_env_vars(self):
@@ -318,16 +335,18 @@ class TestEmsdkManager(unittest.TestCase):
         upstream_dir = emsdk_dir / "upstream" / "emscripten"
         upstream_dir.mkdir(parents=True)
 
-        # Create emsdk_env.sh
-        (emsdk_dir / "emsdk_env.sh").touch()
-
-        # Create tool files
-        tools = ["emcc", "em++", "emar", "emranlib"]
-        for tool in tools:
-            if windows:
-                (upstream_dir / f"{tool}.bat").touch()
-            else:
-                (upstream_dir / tool).touch()
+        # Create emsdk_env.sh and the tool files. os.open with O_CREAT skips
+        # the extra utime syscall that Path.touch performs.
+        ext = ".bat" if windows else ""
+        files = [emsdk_dir / "emsdk_env.sh"]
+        files += [upstream_dir / f"{tool}{ext}" for tool in _EMSDK_TOOLS]
+        for path in files:
+            os.close(os.open(path, os.O_CREAT | os.O_WRONLY, 0o644))
+
+    def _list_upstream_dir(self) -> set[str]:
+        """Helper to list the mock emscripten directory with a single scandir."""
+        with os.scandir(self.manager.emsdk_dir / "upstream" / "emscripten") as it:
+            return {entry.name for entry in it}
 
 
 class TestEmsdkManagerFactory(unittest.TestCase):
@@ -18,23 +18,16 @@ class TestExclusiveArchiveModes(unittest.TestCase):
 
     def setUp(self):
         """Set up test environment."""
+        # Snapshot os.environ so every mutation made by a test is reverted
+        patcher = patch.dict(os.environ)
+        patcher.start()
+        self.addCleanup(patcher.stop)
         # Clear any existing environment variables
         for env_var in [
             "ARCHIVE_BUILD_MODE",
             "NO_THIN_LTO",
         ]:
-            if env_var in os.environ:
-                del os.environ[env_var]
-
-    def tearDown(self):
-        """Clean up test environment."""
-        # Clear any test environment variables
-        for env_var in [
-            "ARCHIVE_BUILD_MODE",
-            "NO_THIN_LTO",
-        ]:
-            if env_var in os.environ:
-                del os.environ[env_var]
+            os.environ.pop(env_var, None)
 
     def test_get_archive_build_mode_default(self):
         """Test that default mode is 'regular' (best performance)."""
@@ -5,109 +5,73 @@ Tests the new native compilation system that uses locally installed EMSDK
 instead of Docker containers. This validates the migration approach.
 """
 
+import os
 import shutil
 import tempfile
+import threading
 import unittest
-from pathlib import Path
-from unittest.mock import Mock, patch
+from pathlib import Path, PurePath
+from unittest.mock import patch
 
+from fastled_wasm_compiler import compile_sketch_native as compile_sketch_native_module
 from fastled_wasm_compiler.compile_sketch_native import (
     NativeCompilerImpl,
 )
-from fastled_wasm_compiler.emsdk_manager import EmsdkManager
-
-
-class TestNativeCompiler(unittest.TestCase):
-    """Test NativeCompiler functionality."""
-
-    def setUp(self):
-        """Set up test environment."""
-        self.temp_dir = Path(tempfile.mkdtemp())
-        self.sketch_dir = self.temp_dir / "sketch"
-        self.sketch_dir.mkdir()
-
-        # Create a simple test sketch
-        sketch_content = """
-#include "FastLED.h"
-
-#define NUM_LEDS 10
-#define DATA_PIN 3
-
-CRGB leds[NUM_LEDS];
-
-void setup() {
-    FastLED.addLeds<WS2812, DATA_PIN, GRB>(leds, NUM_LEDS);
-}
-
-void loop() {
-    fill_rainbow(leds, NUM_LEDS, 0, 255/NUM_LEDS);
-    FastLED.show();
-    delay(100);
-}
-"""
-        (self.sketch_dir / "sketch.ino").write_text(sketch_content)
-
-        # Set up EMSDK manager
-        self.emsdk_dir = self.temp_dir / "emsdk"
-        self.emsdk_manager = EmsdkManager(install_dir=self.emsdk_dir)
-
-    def tearDown(self):
-        """Clean up test environment."""
-        if self.temp_dir.exists():
-            shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    @patch("fastled_wasm_compiler.compile_sketch_native.ensure_fastled_installed")
-    def test_native_compiler_creation(self, mock_fastled: Mock) -> None:
-        """Test creating a native compiler instance."""
-        # Mock FastLED installation
-        mock_fastled_src = self.temp_dir / "fastled" / "src"
-        mock_fastled_src.mkdir(parents=True)
-        (mock_fastled_src / "FastLED.h").write_text("// Mock FastLED header")
-        mock_fastled.return_value = mock_fastled_src
-
-        compiler = NativeCompilerImpl(self.emsdk_dir)
-
-        self.assertIsInstance(compiler, NativeCompilerImpl)
-        self.assertEqual(compiler.emsdk_manager.install_dir, self.emsdk_dir)
 
 
 class TestNativeCompilerUnit(unittest.TestCase):
     """Unit tests for NativeCompiler that don't require EMSDK installation."""
 
+    @classmethod
+    def setUpClass(cls):
+        """Create one scratch root shared by every test in the class."""
+        cls._root = Path(tempfile.mkdtemp(prefix="fwc-"))
+        # Mock FastLED source dir shared by every test. The compiler only
+        # stores this path, so nothing needs to exist on disk.
+        cls._mock_fastled_src = PurePath(cls._root, "fastled", "src")
+
+    @classmethod
+    def tearDownClass(cls):
+        """Remove the shared scratch root."""
+        try:
+            os.rmdir(cls._root)
+        except OSError:
+            shutil.rmtree(cls._root, ignore_errors=True)
+
     def setUp(self):
         """Set up test environment."""
-        self.temp_dir = Path(tempfile.mkdtemp())
+        self.temp_dir = Path(tempfile.mkdtemp(dir=self._root))
         self.emsdk_dir = self.temp_dir / "emsdk"
-        self.emsdk_manager = EmsdkManager(install_dir=self.emsdk_dir)
+
+        # Mock FastLED installation once for every test
+        patcher = patch.object(
+            compile_sketch_native_module,
+            "ensure_fastled_installed",
+            return_value=self._mock_fastled_src,
+        )
+        self.mock_fastled = patcher.start()
+        self.addCleanup(patcher.stop)
 
     def tearDown(self):
-        """Clean up test environment."""
-        if self.temp_dir.exists():
+        """Remove the per-test scratch directory."""
+        # The only thing a test creates here is the install dir made by
+        # EmsdkManager, so remove it directly instead of walking the tree.
+        try:
+            if self.emsdk_dir.exists():
+                os.rmdir(self.emsdk_dir)
+            os.rmdir(self.temp_dir)
+        except OSError:
             shutil.rmtree(self.temp_dir, ignore_errors=True)
 
-    @patch("fastled_wasm_compiler.compile_sketch_native.ensure_fastled_installed")
-    def test_compiler_initialization(self, mock_fastled: Mock) -> None:
+    def test_compiler_initialization(self) -> None:
         """Test compiler initialization."""
-        # Mock FastLED installation
-        mock_fastled_src = self.temp_dir / "fastled" / "src"
-        mock_fastled_src.mkdir(parents=True)
-        (mock_fastled_src / "FastLED.h").write_text("// Mock FastLED header")
-        mock_fastled.return_value = mock_fastled_src
-
         compiler = NativeCompilerImpl(self.emsdk_dir)
 
         self.assertIsInstance(compiler, NativeCompilerImpl)
         self.assertEqual(compiler.emsdk_manager.install_dir, self.emsdk_dir)
 
-    @patch("fastled_wasm_compiler.compile_sketch_native.ensure_fastled_installed")
-    def test_compiler_requires_emsdk_manager(self, mock_fastled: Mock) -> None:
+    def test_compiler_requires_emsdk_manager(self) -> None:
         """Test that compiler can be initialized with or without emsdk_install_dir."""
-        # Mock FastLED installation
-        mock_fastled_src = self.temp_dir / "fastled" / "src"
-        mock_fastled_src.mkdir(parents=True)
-        (mock_fastled_src / "FastLED.h").write_text("// Mock FastLED header")
-        mock_fastled.return_value = mock_fastled_src
-
         # Should work with None (uses default)
         compiler = NativeCompilerImpl(None)
         self.assertIsInstance(compiler, NativeCompilerImpl)
@@ -116,6 +80,47 @@ class TestNativeCompilerUnit(unittest.TestCase):
         compiler = NativeCompilerImpl(self.emsdk_dir)
         self.assertIsInstance(compiler, NativeCompilerImpl)
 
+    def test_compile_sketch_compiles_sources_in_parallel(self) -> None:
+        """Test that sketch sources are compiled concurrently, then linked in order."""
+        sketch_dir = self.temp_dir / "sketch"
+        sketch_dir.mkdir()
+        # a.cpp and a.ino share a stem but must get separate object files
+        for name in ("a.cpp", "b.cpp", "a.ino"):
+            (sketch_dir / name).touch()
+        output_dir = self.temp_dir / "out"
+        build_dir = output_dir / "build" / "debug"
+
+        # Each compile waits for all the others, which only succeeds when
+        # they run at the same time
+        barrier = threading.Barrier(3, timeout=5)
+
+        def compile_stub(source_file: Path, build_mode: str, build_dir: Path) -> Path:
+            barrier.wait()
+            return build_dir / f"{source_file.name}.o"
+
+        compiler = NativeCompilerImpl(self.emsdk_dir)
+        with (
+            patch.object(compiler, "ensure_emsdk") as mock_ensure_emsdk,
+            patch.object(compiler, "_compile_source_to_object", new=compile_stub),
+            patch.object(compiler, "link_objects_to_wasm") as mock_link,
+            patch.object(
+                compile_sketch_native_module.paths,
+                "get_fastled_library_path",
+                return_value=PurePath("libfastled.a"),
+            ),
+            patch.object(
+                compile_sketch_native_module, "_max_compile_workers", return_value=4
+            ),
+        ):
+            compiler.compile_sketch(sketch_dir, "debug", output_dir)
+
+        sources = [*sketch_dir.glob("*.cpp"), *sketch_dir.glob("*.ino")]
+        expected = [build_dir / f"{p.name}.o" for p in sources]
+        self.assertEqual(mock_link.call_args.args[0], expected)
+        self.assertEqual(len(set(expected)), 3)
+        # EMSDK is checked once up front, not once per source file
+        mock_ensure_emsdk.assert_called_once()
+
 
 if __name__ == "__main__":
     unittest.main()
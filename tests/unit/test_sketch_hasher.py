@@ -8,8 +8,14 @@ import shutil
 import unittest
 from pathlib import Path
 from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
-from fastled_wasm_compiler.sketch_hasher import generate_hash_of_project_files
+from fastled_wasm_compiler import sketch_hasher
+from fastled_wasm_compiler.sketch_hasher import (
+    clear_digest_cache,
+    collect_files,
+    generate_hash_of_project_files,
+)
 
 HERE = Path(__file__).parent
 TEST_DATA = HERE / "test_data"
@@ -18,6 +24,21 @@ SKETCH_CACHE = TEST_DATA / "sketch_cache"
 # Check if we're running on macOS
 _IS_MACOS = platform.system() == "Darwin"
 
+# Files the test rewrites; these must be real copies, not links to the cache
+_MODIFIED = frozenset({"sketch.ino"})
+
+
+def _link_or_copy(src: Path, dst: Path, copy: bool) -> None:
+    """Symlink src to dst, copying instead when asked or when linking fails."""
+    if not copy:
+        try:
+            # A symlink also works when the temp dir is on another filesystem
+            os.symlink(src, dst)
+            return
+        except OSError:
+            pass  # e.g. Windows without symlink privileges; fall back to copying
+    shutil.copy(src, dst)
+
 
 class SketchHasherTester(unittest.TestCase):
     """Main tester class."""
@@ -33,6 +54,27 @@ class SketchHasherTester(unittest.TestCase):
         self.assertTrue(SKETCH_CACHE.exists(), "Sketch cache directory does not exist.")
         self.assertTrue(SKETCH_CACHE.is_dir(), "Sketch cache path is not a directory.")
 
+    def test_collect_files_walks_subdirectories(self) -> None:
+        """Test that nested files are collected, split by extension and sorted."""
+        with TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            (tmp_path / "src" / "deep").mkdir(parents=True)
+            (tmp_path / "sketch.ino").write_bytes(b"")
+            (tmp_path / "src" / "deep" / "util.h").write_bytes(b"")
+            (tmp_path / "src" / "data.json").write_bytes(b"")
+            (tmp_path / "README.md").write_bytes(b"")
+
+            project_files = collect_files(tmp_path)
+
+        self.assertEqual(
+            [p.relative_to(tmp_path).as_posix() for p in project_files.src_files],
+            ["sketch.ino", "src/deep/util.h"],
+        )
+        self.assertEqual(
+            [p.relative_to(tmp_path).as_posix() for p in project_files.other_files],
+            ["README.md", "src/data.json"],
+        )
+
     @unittest.skipIf(_IS_MACOS, "Skipping test on macOS")
     def test_sketch_hash(self) -> None:
         # copy to a temporary directory
@@ -52,17 +94,15 @@ class SketchHasherTester(unittest.TestCase):
                     file_path.exists(),
                     f"File {file_str} does not exist in sketch cache.",
                 )
-                shutil.copy(file_path, tmp_path)
+                _link_or_copy(file_path, tmp_path / file_str, file_str in _MODIFIED)
 
             original_hash = generate_hash_of_project_files(tmp_path)
             print(f"Original hash: {original_hash}")
             # now open up the sketch.ino file and change #include "old.h" -> #include "curr.h"
             sketch_file = tmp_path / "sketch.ino"
-            with sketch_file.open("r") as f:
-                content = f.read()
-            content = content.replace('#include "old.h"', '#include "curr.h"')
-            with sketch_file.open("w") as f:
-                f.write(content)
+            sketch_file.write_text(
+                sketch_file.read_text().replace('#include "old.h"', '#include "curr.h"')
+            )
 
             # generate the hash again
             new_hash = generate_hash_of_project_files(tmp_path)
@@ -75,6 +115,62 @@ class SketchHasherTester(unittest.TestCase):
             )
             print("Test completed successfully, hashes are different as expected.")
 
+    @unittest.skipIf(_IS_MACOS, "Skipping test on macOS")
+    def test_hash_is_deterministic(self) -> None:
+        """Test that hashing the same project from scratch gives the same hash."""
+        with TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            for file_str in ("sketch.ino", "curr.h", "old.h"):
+                _link_or_copy(SKETCH_CACHE / file_str, tmp_path / file_str, False)
+            (tmp_path / "data.bin").write_bytes(bytes(range(256)))
+
+            hashes = []
+            for _ in range(2):
+                clear_digest_cache()
+                hashes.append(generate_hash_of_project_files(tmp_path))
+
+        self.assertEqual(hashes[0], hashes[1])
+        self.assertRegex(hashes[0], r"^[0-9a-f]{32}$")
+
+    @unittest.skipIf(_IS_MACOS, "Skipping test on macOS")
+    def test_parallel_hash_matches_serial_hash(self) -> None:
+        """Test that hashing files on the thread pool gives the serial result."""
+        with TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            for file_str in ("sketch.ino", "curr.h", "old.h"):
+                _link_or_copy(SKETCH_CACHE / file_str, tmp_path / file_str, False)
+            for i in range(16):
+                (tmp_path / f"data_{i}.bin").write_bytes(bytes([i]) * (i + 1))
+
+            hashes = []
+            for threshold in (1, 1000):
+                clear_digest_cache()
+                with patch.object(sketch_hasher, "_PARALLEL_HASH_THRESHOLD", threshold):
+                    hashes.append(generate_hash_of_project_files(tmp_path))
+
+        self.assertEqual(hashes[0], hashes[1])
+
+    @unittest.skipIf(_IS_MACOS, "Skipping test on macOS")
+    def test_unchanged_sources_are_not_preprocessed_again(self) -> None:
+        """Test that rehashing an unchanged project reuses the cached hash."""
+        clear_digest_cache()
+        with TemporaryDirectory() as tmpdir:
+            tmp_path = Path(tmpdir)
+            for file_str in ("sketch.ino", "curr.h", "old.h"):
+                _link_or_copy(SKETCH_CACHE / file_str, tmp_path / file_str, False)
+            (tmp_path / "data.bin").write_bytes(b"\x00\x01")
+
+            with patch.object(
+                sketch_hasher,
+                "preprocess_with_gcc",
+                wraps=sketch_hasher.preprocess_with_gcc,
+            ) as mock_preprocess:
+                first_hash = generate_hash_of_project_files(tmp_path)
+                second_hash = generate_hash_of_project_files(tmp_path)
+
+            self.assertEqual(first_hash, second_hash)
+            mock_preprocess.assert_called_once()
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -7,6 +7,7 @@ import unittest
 from pathlib import Path
 
 from fastled_wasm_compiler.dwarf_path_to_file_path import (
+    _resolve_path_cached,
     dwarf_path_to_file_path,
 )
 from fastled_wasm_compiler.dwarf_path_to_file_path import logger as dwarf_logger
@@ -15,27 +16,61 @@ from fastled_wasm_compiler.dwarf_path_to_file_path import (
 )
 from fastled_wasm_compiler.paths import get_fastled_source_path
 
-# Set debug logging for the path resolution module
-dwarf_logger.setLevel(logging.DEBUG)
-# Add a handler if there isn't one already
-if not dwarf_logger.handlers:
-    handler = logging.StreamHandler()
-    handler.setFormatter(logging.Formatter("%(name)s - %(levelname)s - %(message)s"))
-    dwarf_logger.addHandler(handler)
+# Use environment-variable driven path instead of absolute system path.
+# The leading slash is removed once here to avoid double slashes.
+FASTLED_SRC_STR_RELATIVE = get_fastled_source_path().lstrip("/")
+
+# (dwarf path, expected resolved path) pairs for the FastLED source layouts
+_FASTLED_PATTERN_CASES = (
+    (
+        f"fastledsource/js/src/fastledsource/{FASTLED_SRC_STR_RELATIVE}/FastLED.h",
+        f"/{FASTLED_SRC_STR_RELATIVE}/FastLED.h",
+    ),
+    (
+        f"/dwarfsource/js/dwarfsource/{FASTLED_SRC_STR_RELATIVE}/pixel_iterator.h",
+        f"/{FASTLED_SRC_STR_RELATIVE}/pixel_iterator.h",
+    ),
+    (
+        f"dwarfsource/js/sketchsource/{FASTLED_SRC_STR_RELATIVE}/FastLED.h",
+        f"/{FASTLED_SRC_STR_RELATIVE}/FastLED.h",
+    ),
+    ("dwarfsource/js/src/timer.h", "/js/src/timer.h"),
+    ("sketchsource/js/src/direct.h", "/js/src/direct.h"),
+)
 
-# Use environment-variable driven path instead of absolute system path
-FASTLED_SRC_STR_RELATIVE = get_fastled_source_path()
+# (dwarf path, expected pruned path) pairs covering each default prefix
+_PRUNE_CASES = (
+    ("dwarfsource/js/dwarfsource/js/src/timer.h", "js/src/timer.h"),
+    ("/sketchsource/js/src/direct.h", "js/src/direct.h"),
+    # The last prefix in the path wins
+    ("fastledsource/js/dwarfsource/a.h", "a.h"),
+    # Empty and "." components are normalized away
+    ("fastledsource//x/./y.h", "x/y.h"),
+    # Nothing follows the prefix
+    ("js/fastledsource", None),
+)
 
 
 class SourceFileResolverTester(unittest.TestCase):
     """Main tester class."""
 
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Enable debug logging for the path resolution module once."""
+        dwarf_logger.setLevel(logging.DEBUG)
+        # Add a handler if there isn't one already
+        if not dwarf_logger.handlers:
+            handler = logging.StreamHandler()
+            handler.setFormatter(
+                logging.Formatter("%(name)s - %(levelname)s - %(message)s")
+            )
+            dwarf_logger.addHandler(handler)
+
     def test_prune_paths(self) -> None:
         """Test the path pruning function."""
 
         # Test with environment-variable driven path
-        # Remove leading slash from FASTLED_SRC_STR_RELATIVE to avoid double slashes
-        fastled_path = FASTLED_SRC_STR_RELATIVE.lstrip("/")
+        fastled_path = FASTLED_SRC_STR_RELATIVE
         path = f"fastledsource/js/src/fastledsource/{fastled_path}/FastLED.h"
         out = prune_paths(path)
         self.assertIsInstance(out, str)
@@ -52,6 +87,12 @@ class SourceFileResolverTester(unittest.TestCase):
             "emsdk/upstream/lib/clang/21/include/__stddef_max_align_t.h",
         )
 
+    def test_prune_paths_prefixes(self) -> None:
+        """Test that pruning keeps only what follows the last known prefix."""
+        for path, expected in _PRUNE_CASES:
+            with self.subTest(path=path):
+                self.assertEqual(prune_paths(path), expected)
+
     def check_path(self, path: str, expected: str) -> None:
         """Check the path."""
         out = dwarf_path_to_file_path(path, check_exists=False)
@@ -65,33 +106,33 @@ class SourceFileResolverTester(unittest.TestCase):
 
     def test_fastled_patterns(self) -> None:
         """Test command line interface (CLI)."""
-        # Remove leading slash from FASTLED_SRC_STR_RELATIVE to avoid double slashes
-        fastled_path = FASTLED_SRC_STR_RELATIVE.lstrip("/")
-
-        self.check_path(
-            f"fastledsource/js/src/fastledsource/{fastled_path}/FastLED.h",
-            f"/{fastled_path}/FastLED.h",
-        )
-
-        self.check_path(
-            f"/dwarfsource/js/dwarfsource/{fastled_path}/pixel_iterator.h",
-            f"/{fastled_path}/pixel_iterator.h",
-        )
-
-        self.check_path(
-            f"dwarfsource/js/sketchsource/{fastled_path}/FastLED.h",
-            f"/{fastled_path}/FastLED.h",
-        )
-
-        self.check_path(
-            "dwarfsource/js/src/timer.h",
-            "/js/src/timer.h",
-        )
-
-        self.check_path(
-            "sketchsource/js/src/direct.h",
-            "/js/src/direct.h",
-        )
+        for path, expected in _FASTLED_PATTERN_CASES:
+            with self.subTest(path=path):
+                self.check_path(path, expected)
+
+    def test_repeated_resolution_is_cached(self) -> None:
+        """Test that resolving the same path twice reuses the cached result."""
+        _resolve_path_cached.cache_clear()
+        self.check_path("sketchsource/js/src/direct.h", "/js/src/direct.h")
+        self.check_path("sketchsource/js/src/direct.h", "/js/src/direct.h")
+        cache_info = _resolve_path_cached.cache_info()
+        self.assertEqual((cache_info.misses, cache_info.hits), (1, 1))
+
+    def test_repeated_errors_are_not_cached(self) -> None:
+        """Test that each failed resolution returns a new error and warns again."""
+        _resolve_path_cached.cache_clear()
+        for _ in range(2):
+            with self.assertWarns(UserWarning):
+                dwarf_path_to_file_path(
+                    "fastledsource/js/../../etc/passwd", check_exists=False
+                )
+
+        first = dwarf_path_to_file_path("/not_a_prefix/file.h", check_exists=False)
+        second = dwarf_path_to_file_path("/not_a_prefix/file.h", check_exists=False)
+        self.assertIsInstance(first, Exception)
+        self.assertIsInstance(second, Exception)
+        self.assertIsNot(first, second)
+        self.assertEqual(_resolve_path_cached.cache_info().currsize, 0)
 
 
 if __name__ == "__main__":
@@ -5,76 +5,110 @@ This test verifies that the compiler always uses fresh source files
 and never compiles stale cached versions.
 """
 
+import dataclasses
 import shutil
 import tempfile
 import unittest
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
+import pytest
+
+from fastled_wasm_compiler import compile as compile_module
 from fastled_wasm_compiler.args import Args
 from fastled_wasm_compiler.run_compile import run_compile as run
-
-
+from fastled_wasm_compiler.types import BuildMode
+
+
+def _fake_compile_cmd_list(compiler_root: Path, build_mode: BuildMode) -> list[str]:
+    """Stand-in compile command that succeeds without compiling anything."""
+    return ["echo", "fake compile"]
+
+
+# Flags shared by every compile in these tests; the paths are filled in per test
+_DEFAULT_ARGS = Args(
+    compiler_root=Path(),
+    assets_dirs=Path(),
+    mapped_dir=Path(),
+    keep_files=True,  # Keep files to test caching
+    only_copy=False,
+    only_insert_header=False,
+    only_compile=False,
+    profile=False,
+    disable_auto_clean=True,
+    debug=False,
+    fast_debug=False,
+    quick=True,
+    release=False,
+    clear_ccache=False,
+    strict=False,
+)
+
+
+@pytest.mark.usefixtures("shared_assets_dir")
 class StaleCacheTest(unittest.TestCase):
     """Test that stale cached files are never used."""
 
+    # Read-only Vite dist/ asset tree, shared across the session (conftest.py)
+    assets_dir: Path
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Create the parent dir for every test's scratch directories."""
+        cls._class_tmp = Path(tempfile.mkdtemp())
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        """Remove every test's directories."""
+        shutil.rmtree(cls._class_tmp, ignore_errors=True)
+
     def setUp(self) -> None:
         """Set up test environment with temporary directories."""
-        # Create temporary directories
-        self.temp_dir = Path(tempfile.mkdtemp())
+        # Create temporary directories for the parts each test modifies. They
+        # live under the class dir, so tearDownClass removes them all at once.
+        self.temp_dir = Path(tempfile.mkdtemp(dir=self._class_tmp))
         self.compiler_root = self.temp_dir / "compiler_root"
         self.mapped_dir = self.temp_dir / "mapped"
         self.sketch_dir = self.mapped_dir / "sketch"
-        self.assets_dir = self.temp_dir / "assets"
 
         # Create directory structure
         self.compiler_root.mkdir(parents=True)
         self.sketch_dir.mkdir(parents=True)
-        self.assets_dir.mkdir(parents=True)
-
-        # Create required asset files (Vite dist/ output structure)
-        dist_dir = self.assets_dir / "dist"
-        dist_dir.mkdir()
-        (dist_dir / "index.html").write_text("<html></html>")
-        (dist_dir / "index.css").write_text("body {}")
-        (dist_dir / "index.js").write_text("console.log('test');")
 
         # Create initial sketch file
         self.sketch_file = self.sketch_dir / "test.ino"
         self.initial_content = "void setup() { int x = 1; }\nvoid loop() {}"
         self.sketch_file.write_text(self.initial_content)
 
-    def tearDown(self) -> None:
-        """Clean up test environment."""
-        if self.temp_dir.exists():
-            shutil.rmtree(self.temp_dir, ignore_errors=True)
-
-    @patch("fastled_wasm_compiler.compile._new_compile_cmd_list")
-    def test_fresh_files_always_copied_normal_build(
-        self, mock_compile: MagicMock
-    ) -> None:
-        """Test that fresh files are always copied during normal build."""
-        mock_compile.return_value = ["echo", "fake compile"]
+        # Swap in a plain function; the tests never inspect the compile call
+        patcher = patch.object(
+            compile_module, "_new_compile_cmd_list", new=_fake_compile_cmd_list
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
-        # First compilation with initial content
-        args: Args = Args(
+    def _make_args(self, **overrides: bool) -> Args:
+        """Return the default args pointed at this test's directories."""
+        return dataclasses.replace(
+            _DEFAULT_ARGS,
             compiler_root=self.compiler_root,
             assets_dirs=self.assets_dir,
             mapped_dir=self.mapped_dir,
-            keep_files=True,  # Keep files to test caching
-            only_copy=False,
-            only_insert_header=False,
-            only_compile=False,
-            profile=False,
-            disable_auto_clean=True,
-            debug=False,
-            fast_debug=False,
-            quick=True,
-            release=False,
-            clear_ccache=False,
-            strict=False,
+            **overrides,
         )
 
+    def _assert_fresh_content(self, path: Path, fresh: bytes, stale: bytes) -> None:
+        """Assert path contains the fresh snippet and not the stale one."""
+        # Read once and search raw bytes; the snippets are plain ASCII
+        content = path.read_bytes()
+        self.assertIn(fresh, content, f"{path.name} should contain {fresh!r}")
+        self.assertNotIn(stale, content, f"{path.name} should NOT contain {stale!r}")
+
+    def test_fresh_files_always_copied_normal_build(self) -> None:
+        """Test that fresh files are always copied during normal build."""
+        # First compilation with initial content
+        args = self._make_args()
+
         rtn = run(args)
         self.assertEqual(0, rtn)
 
@@ -94,25 +128,10 @@ class StaleCacheTest(unittest.TestCase):
         self.assertEqual(0, rtn)
 
         # Verify that the processed file has NEW content
-        processed_content = processed_file.read_text()
-        self.assertIn(
-            "int y = 2",
-            processed_content,
-            "Processed file should contain NEW content (int y = 2)",
-        )
-        self.assertNotIn(
-            "int x = 1",
-            processed_content,
-            "Processed file should NOT contain OLD content (int x = 1)",
-        )
+        self._assert_fresh_content(processed_file, b"int y = 2", b"int x = 1")
 
-    @patch("fastled_wasm_compiler.compile._new_compile_cmd_list")
-    def test_fresh_files_copied_with_only_compile_flag(
-        self, mock_compile: MagicMock
-    ) -> None:
+    def test_fresh_files_copied_with_only_compile_flag(self) -> None:
         """Test that fresh files are copied even when using --only-compile flag."""
-        mock_compile.return_value = ["echo", "fake compile"]
-
         # First, manually populate sketch_tmp with stale content
         sketch_tmp = self.compiler_root / "src"
         sketch_tmp.mkdir(parents=True, exist_ok=True)
@@ -125,45 +144,18 @@ class StaleCacheTest(unittest.TestCase):
         self.sketch_file.write_text(fresh_content)
 
         # Run with only_compile flag - this was the bug scenario
-        args: Args = Args(
-            compiler_root=self.compiler_root,
-            assets_dirs=self.assets_dir,
-            mapped_dir=self.mapped_dir,
-            keep_files=True,
-            only_copy=False,
-            only_insert_header=False,
+        args = self._make_args(
             only_compile=True,  # This flag was causing stale cache issue
-            profile=False,
-            disable_auto_clean=True,
-            debug=False,
-            fast_debug=False,
-            quick=True,
-            release=False,
-            clear_ccache=False,
-            strict=False,
         )
 
         rtn = run(args)
         self.assertEqual(0, rtn)
 
         # Verify that FRESH content was used, not STALE
-        processed_content = stale_file.read_text()
-        self.assertIn(
-            "int FRESH = 1",
-            processed_content,
-            "Should use FRESH content from source, not stale cache",
-        )
-        self.assertNotIn(
-            "int STALE = 999",
-            processed_content,
-            "Should NOT use STALE cached content",
-        )
+        self._assert_fresh_content(stale_file, b"int FRESH = 1", b"int STALE = 999")
 
-    @patch("fastled_wasm_compiler.compile._new_compile_cmd_list")
-    def test_sketch_tmp_cleaned_before_copy(self, mock_compile: MagicMock) -> None:
+    def test_sketch_tmp_cleaned_before_copy(self) -> None:
         """Test that sketch_tmp directory is cleaned before copying fresh files."""
-        mock_compile.return_value = ["echo", "fake compile"]
-
         # Create stale files in sketch_tmp
         sketch_tmp = self.compiler_root / "src"
         sketch_tmp.mkdir(parents=True, exist_ok=True)
@@ -176,23 +168,7 @@ class StaleCacheTest(unittest.TestCase):
         self.sketch_file.write_text("void setup() {}\nvoid loop() {}")
 
         # Run compilation
-        args: Args = Args(
-            compiler_root=self.compiler_root,
-            assets_dirs=self.assets_dir,
-            mapped_dir=self.mapped_dir,
-            keep_files=True,
-            only_copy=False,
-            only_insert_header=False,
-            only_compile=False,
-            profile=False,
-            disable_auto_clean=True,
-            debug=False,
-            fast_debug=False,
-            quick=True,
-            release=False,
-            clear_ccache=False,
-            strict=False,
-        )
+        args = self._make_args()
 
         rtn = run(args)
         self.assertEqual(0, rtn)
@@ -2,27 +2,165 @@
 Unit test file.
 """
 
+import filecmp
 import os
 import shutil
+import sys
 import tempfile
 import unittest
 import zipfile
-from pathlib import Path
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path, PurePosixPath
+from unittest.mock import patch
 
 import httpx
 
-from fastled_wasm_compiler.sync import ALLOWED_EXTENSIONS, _sync_directory, sync_fastled
-
-HERE = Path(__file__).parent
-SYNC_DATA = HERE / ".sync_data"
-SYNC_DATA_SRC = SYNC_DATA / "src"
-SYNC_DATA_DST = SYNC_DATA / "dst"
+from fastled_wasm_compiler.sync import (
+    ALLOWED_EXTENSIONS,
+    _is_asset_only_file,
+    _is_library_affecting_file,
+    _sync_directory,
+    sync_fastled,
+)
 
 # Cache downloaded file to speed up repeated test runs
 CACHE_DIR = Path.cwd() / ".cache" / "test-fastled-downloads"
-CACHE_DIR.mkdir(parents=True, exist_ok=True)
 
 URL = "https://github.com/FastLED/FastLED/archive/refs/heads/master.zip"
+_DOWNLOAD_CHUNK_SIZE = 64 * 1024
+_EXTRACT_CHUNK_SIZE = 1 << 20
+# sync_fastled only reads src/ and its sibling examples/, so the rest of the
+# FastLED archive (tests, ci, docs, ...) is never extracted
+_EXTRACTED_SUBDIRS = frozenset({"src", "examples"})
+
+_RUN_INTEGRATION_TESTS = bool(os.environ.get("RUN_INTEGRATION_TESTS"))
+
+# The sync code always uses its Python fallback on Windows, because Git Bash's
+# find command has issues with Windows paths and complex expressions. On
+# Unix-like systems, skip the sync tests if find is missing, though the Python
+# fallback would be used automatically in that case.
+_FIND_UNAVAILABLE = sys.platform != "win32" and shutil.which("find") is None
+_FIND_UNAVAILABLE_REASON = (
+    "Unix find command not available - file sync will use Python fallback"
+)
+
+# Threads used to write the extension filtering fixture files
+_WRITE_WORKERS = 16
+
+# Sample paths for the file classification tests, built once at import time
+_LIBRARY_FILES = (
+    Path("src/fl/led.cpp"),
+    Path("FastLED.h"),
+    Path("library.properties.txt"),
+)
+_ASSET_FILES = (
+    Path("platforms/wasm/index.js"),
+    Path("modules/app.mjs"),
+    Path("index.html"),
+)
+_UNCLASSIFIED_FILE = Path("README")
+
+
+# Extension filtering fixtures, as bytes so every file is written the same way.
+# Files with allowed extensions (should be synced)
+_ALLOWED_FILES: dict[str, bytes] = {
+    # Regular source files
+    "main.cpp": b"int main() { return 0; }",
+    "header.h": b"#pragma once",
+    "another.hpp": b"#include <iostream>",
+    "config.ini": b"[section]\nkey=value",
+    "script.js": b"console.log('hello');",
+    "module.mjs": b"export default {};",
+    "types.ts": b"// TypeScript definitions",
+    "page.html": b"<html><body></body></html>",
+    "style.css": b"body { margin: 0; }",
+    "readme.txt": b"This is a readme file",
+    "source.c": b"#include <stdio.h>",
+    "alt.cc": b"// C++ code",
+    "extended.cxx": b"// Another C++ file",
+    "plus.c++": b"// C++ with plus extension",
+    "alt_header.hh": b"// Alternative header",
+    "extended_header.hxx": b"// Extended header",
+    "plus_header.h++": b"// Header with plus",
+    # Files directly in platforms/ (should be included)
+    "platforms/platform_config.h": b"#define PLATFORM_CONFIG",
+    "platforms/common.cpp": b"// Common platform code",
+    # Files in allowed platform subdirectories (should be included)
+    "platforms/shared/shared_utils.h": b"#pragma once // shared",
+    "platforms/shared/shared_impl.cpp": b"// shared implementation",
+    "platforms/wasm/wasm_specific.h": b"#pragma once // wasm",
+    "platforms/wasm/wasm_impl.cpp": b"// wasm implementation",
+    "platforms/stub/stub_header.h": b"#pragma once // stub",
+    "platforms/stub/stub_impl.cpp": b"// stub implementation",
+    # Unity build now includes all platform subdirectories
+    "platforms/arduino/arduino_code.cpp": b"// Arduino specific code",
+    "platforms/arduino/arduino_header.h": b"#pragma once // arduino",
+    "platforms/esp32/esp32_code.cpp": b"// ESP32 specific code",
+    "platforms/esp32/esp32_header.h": b"#pragma once // esp32",
+    "platforms/unknown/unknown_code.cpp": b"// Unknown platform code",
+}
+
+# Files that should be excluded (no extension or disallowed extensions)
+_EXCLUDED_FILES: dict[str, bytes] = {
+    # Files without proper extensions
+    "unsuffixed_file": b"This file has no extension",
+    "readme": b"This readme has no extension",
+    "_readme": b"This _readme has no extension",
+    "Makefile": b"# This is a Makefile",
+    "LICENSE": b"MIT License text",
+    "image.png": b"fake png data",
+    "photo.jpg": b"fake jpg data",
+    "animation.gif": b"fake gif data",
+    "documentation.md": b"# Markdown documentation",
+    "script.py": b"print('Python script')",
+    "archive.zip": b"fake zip data",
+    "executable": b"#!/bin/bash\necho hello",
+    "config.yaml": b"key: value",
+    "data.json": b'{"key": "value"}',
+    "backup.bak": b"backup file",
+    "temp.tmp": b"temporary file",
+    "log.log": b"log entries",
+    "example.disabled": b"disabled file",
+}
+
+
+def _relative_files(root: Path) -> set[str]:
+    """Return the posix path, relative to root, of every file under root."""
+    files: set[str] = set()
+    # os.walk yields plain name strings, so the relative prefix is computed
+    # once per directory rather than once per file
+    for dirpath, _, filenames in os.walk(root):
+        rel = os.path.relpath(dirpath, root)
+        prefix = "" if rel == "." else rel.replace(os.sep, "/") + "/"
+        files.update(prefix + name for name in filenames)
+    return files
+
+
+def _write_file(path: str, data: bytes) -> None:
+    """Create or truncate path and write data to it."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        os.write(fd, data)
+    finally:
+        os.close(fd)
+
+
+def _write_files(root: Path, files: Mapping[str, bytes]) -> None:
+    """Write files, given by posix path relative to root, creating parents."""
+    # One makedirs per distinct parent instead of one mkdir per file
+    for parent in {os.path.dirname(name) for name in files} - {""}:
+        os.makedirs(os.path.join(root, parent), exist_ok=True)
+    # The GIL is released during the open/write syscalls, so the writes overlap
+    with ThreadPoolExecutor(max_workers=_WRITE_WORKERS) as executor:
+        # Consume the results so any write error is raised here
+        list(
+            executor.map(
+                _write_file,
+                [os.path.join(root, name) for name in files],
+                files.values(),
+            )
+        )
 
 
 def _get_first_directory(src: Path) -> Path:
@@ -33,31 +171,82 @@ def _get_first_directory(src: Path) -> Path:
     raise FileNotFoundError("No directories found in sync data source.")
 
 
+def _extract_zip(zip_path: Path, dest: Path, subdirs: frozenset[str]) -> None:
+    """Extract the given subdirs of the archive's top-level dir into dest.
+
+    Members are copied in large chunks; extractall copies in small blocks,
+    which means many write calls for a big archive.
+    """
+    with zipfile.ZipFile(zip_path, "r") as zip_ref:
+        for info in zip_ref.infolist():
+            parts = PurePosixPath(info.filename).parts
+            # extractall sanitizes member names; do the same by refusing them
+            if info.filename.startswith("/") or ".." in parts:
+                raise ValueError(f"Unsafe path in archive: {info.filename}")
+            if len(parts) < 2 or parts[1] not in subdirs:
+                continue
+            target = os.path.join(dest, *parts)
+            if info.is_dir():
+                os.makedirs(target, exist_ok=True)
+                continue
+            os.makedirs(os.path.dirname(target), exist_ok=True)
+            with zip_ref.open(info) as src, open(target, "wb") as dst:
+                shutil.copyfileobj(src, dst, _EXTRACT_CHUNK_SIZE)
+
+
+def _fastled_master_dir() -> Path:
+    """Return the extracted FastLED master tree, downloading it if needed."""
+    # Use cached download to speed up repeated test runs; the cache dir is
+    # only created here so collecting the tests touches no files
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    cached_zip = CACHE_DIR / "fastled-master.zip"
+
+    if not cached_zip.exists():
+        print("Downloading FastLED repository (cached for future runs)...")
+        # Stream to disk in chunks instead of buffering the whole archive, and
+        # only move it into place once complete
+        partial_zip = cached_zip.with_name(cached_zip.name + ".partial")
+        total = 0
+        with (
+            httpx.stream("GET", URL, follow_redirects=True) as response,
+            open(partial_zip, "wb") as f,
+        ):
+            for chunk in response.iter_bytes(_DOWNLOAD_CHUNK_SIZE):
+                f.write(chunk)
+                total += len(chunk)
+        assert total >= 10000, "Downloaded file is too small"
+        os.replace(partial_zip, cached_zip)
+        print(f"Downloaded and cached: {cached_zip}")
+    else:
+        print(f"Using cached download: {cached_zip}")
+
+    # Extract each downloaded archive only once; the sync only reads the
+    # source tree, so later runs use the cached extraction directly.
+    zip_stat = cached_zip.stat()
+    extracted_dir = CACHE_DIR / f"extracted-{zip_stat.st_size}-{zip_stat.st_mtime_ns}"
+    if not extracted_dir.is_dir():
+        # Extract next to the cache first so an interrupted run never
+        # leaves a partial tree that looks complete
+        partial_dir = extracted_dir.with_name(extracted_dir.name + ".partial")
+        shutil.rmtree(partial_dir, ignore_errors=True)
+        # Read the cached archive in place instead of staging a copy
+        _extract_zip(cached_zip, partial_dir, _EXTRACTED_SUBDIRS)
+        os.replace(partial_dir, extracted_dir)
+    else:
+        print(f"Using cached extraction: {extracted_dir}")
+
+    first_dir = _get_first_directory(extracted_dir)
+    print(f"first_dir: {first_dir}")
+    assert first_dir.is_dir(), f"Expected {first_dir.absolute()} to be a directory"
+    assert (first_dir / "src").exists(), "Expected FastLED-master directory"
+    assert (first_dir / "src" / "FastLED.h").exists(), "Expected FastLED.h file"
+    return first_dir
+
+
+@unittest.skipIf(_FIND_UNAVAILABLE, _FIND_UNAVAILABLE_REASON)
 class ExtensionFilteringTester(unittest.TestCase):
     """Test class for extension-based file filtering functionality."""
 
-    def setUp(self) -> None:
-        """Check if Unix find command is available (not on Windows).
-
-        Note: The sync code automatically uses Python fallback on Windows because
-        Git Bash's find command has issues with Windows paths and complex expressions.
-        On Unix-like systems, we check if find is available and skip if it's not,
-        though the Python fallback would be used automatically in that case.
-        """
-        import shutil
-        import sys
-
-        # On Windows, we always use Python fallback, so find command isn't needed
-        if sys.platform == "win32":
-            return
-
-        # On Unix-like systems, check if find is available
-        find_cmd = shutil.which("find")
-        if not find_cmd:
-            self.skipTest(
-                "Unix find command not available - file sync will use Python fallback"
-            )
-
     def test_extension_filtering(self) -> None:
         """Test that only files with allowed extensions are synced and unsuffixed files are excluded."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -65,102 +254,19 @@ class ExtensionFilteringTester(unittest.TestCase):
             dst_dir = Path(tmpdir) / "test_dst"
             src_dir.mkdir()
 
-            # Create directory structure for platforms testing
-            (src_dir / "platforms").mkdir()
-            (src_dir / "platforms" / "shared").mkdir()
-            (src_dir / "platforms" / "wasm").mkdir()
-            (src_dir / "platforms" / "stub").mkdir()
-            (src_dir / "platforms" / "arduino").mkdir()  # Included (unity build)
-            (src_dir / "platforms" / "esp32").mkdir()  # Included (unity build)
-            (src_dir / "platforms" / "unknown").mkdir()  # Included (unity build)
-
-            # Create files with allowed extensions (should be synced)
-            allowed_files = {
-                # Regular source files
-                "main.cpp": "int main() { return 0; }",
-                "header.h": "#pragma once",
-                "another.hpp": "#include <iostream>",
-                "config.ini": "[section]\nkey=value",
-                "script.js": "console.log('hello');",
-                "module.mjs": "export default {};",
-                "types.ts": "// TypeScript definitions",
-                "page.html": "<html><body></body></html>",
-                "style.css": "body { margin: 0; }",
-                "readme.txt": "This is a readme file",
-                "source.c": "#include <stdio.h>",
-                "alt.cc": "// C++ code",
-                "extended.cxx": "// Another C++ file",
-                "plus.c++": "// C++ with plus extension",
-                "alt_header.hh": "// Alternative header",
-                "extended_header.hxx": "// Extended header",
-                "plus_header.h++": "// Header with plus",
-                # Files directly in platforms/ (should be included)
-                "platforms/platform_config.h": "#define PLATFORM_CONFIG",
-                "platforms/common.cpp": "// Common platform code",
-                # Files in allowed platform subdirectories (should be included)
-                "platforms/shared/shared_utils.h": "#pragma once // shared",
-                "platforms/shared/shared_impl.cpp": "// shared implementation",
-                "platforms/wasm/wasm_specific.h": "#pragma once // wasm",
-                "platforms/wasm/wasm_impl.cpp": "// wasm implementation",
-                "platforms/stub/stub_header.h": "#pragma once // stub",
-                "platforms/stub/stub_impl.cpp": "// stub implementation",
-                # Unity build now includes all platform subdirectories
-                "platforms/arduino/arduino_code.cpp": "// Arduino specific code",
-                "platforms/arduino/arduino_header.h": "#pragma once // arduino",
-                "platforms/esp32/esp32_code.cpp": "// ESP32 specific code",
-                "platforms/esp32/esp32_header.h": "#pragma once // esp32",
-                "platforms/unknown/unknown_code.cpp": "// Unknown platform code",
-            }
-
-            # Create files that should be excluded (no extension or disallowed extensions)
-            excluded_files = {
-                # Files without proper extensions
-                "unsuffixed_file": "This file has no extension",
-                "readme": "This readme has no extension",
-                "_readme": "This _readme has no extension",
-                "Makefile": "# This is a Makefile",
-                "LICENSE": "MIT License text",
-                "image.png": b"fake png data",
-                "photo.jpg": b"fake jpg data",
-                "animation.gif": b"fake gif data",
-                "documentation.md": "# Markdown documentation",
-                "script.py": "print('Python script')",
-                "archive.zip": b"fake zip data",
-                "executable": "#!/bin/bash\necho hello",
-                "config.yaml": "key: value",
-                "data.json": '{"key": "value"}',
-                "backup.bak": "backup file",
-                "temp.tmp": "temporary file",
-                "log.log": "log entries",
-                "example.disabled": "disabled file",
-            }
-
-            # Write allowed files to source directory
-            for filename, content in allowed_files.items():
-                file_path = src_dir / filename
-                file_path.parent.mkdir(parents=True, exist_ok=True)
-                if isinstance(content, str):
-                    file_path.write_text(content)
-                else:
-                    file_path.write_bytes(content)
-
-            # Write excluded files to source directory
-            for filename, content in excluded_files.items():
-                file_path = src_dir / filename
-                file_path.parent.mkdir(parents=True, exist_ok=True)
-                if isinstance(content, str):
-                    file_path.write_text(content)
-                else:
-                    file_path.write_bytes(content)
-
-            # Verify all test files were created
-            all_src_files = list(src_dir.rglob("*"))
-            all_src_file_count = len([f for f in all_src_files if f.is_file()])
-            expected_total = len(allowed_files) + len(excluded_files)
-            self.assertEqual(
-                all_src_file_count,
-                expected_total,
-                f"Expected {expected_total} files, got {all_src_file_count}",
+            allowed_files = _ALLOWED_FILES
+            excluded_files = _EXCLUDED_FILES
+
+            # Write all files to source directory; the platforms/ subdirectories
+            # are created from the file paths
+            _write_files(src_dir, allowed_files)
+            _write_files(src_dir, excluded_files)
+
+            # _write_files raises if any write fails, so every file exists
+            # unless the two sets share a name
+            overlap = allowed_files.keys() & excluded_files.keys()
+            self.assertFalse(
+                overlap, f"Files both allowed and excluded: {sorted(overlap)}"
             )
 
             # Perform sync
@@ -175,35 +281,28 @@ class ExtensionFilteringTester(unittest.TestCase):
             self.assertEqual(len(sync_result.all_changed_files), len(allowed_files))
 
             # Check that all allowed files were copied
-            dst_files = {
-                f.relative_to(dst_dir).as_posix()
-                for f in dst_dir.rglob("*")
-                if f.is_file()
-            }
-
-            for allowed_file in allowed_files.keys():
-                self.assertIn(
-                    allowed_file,
-                    dst_files,
-                    f"Allowed file '{allowed_file}' should have been synced",
-                )
+            dst_files = _relative_files(dst_dir)
 
-                # Verify file content was copied correctly
-                src_content = (src_dir / allowed_file).read_text(errors="ignore")
-                dst_content = (dst_dir / allowed_file).read_text(errors="ignore")
-                self.assertEqual(
-                    src_content,
-                    dst_content,
+            missing = set(allowed_files) - dst_files
+            self.assertFalse(
+                missing, f"Allowed files should have been synced: {sorted(missing)}"
+            )
+
+            for allowed_file in allowed_files:
+                # Verify file content was copied correctly; filecmp checks the
+                # sizes first and only then compares raw bytes, with no decode
+                self.assertTrue(
+                    filecmp.cmp(
+                        src_dir / allowed_file, dst_dir / allowed_file, shallow=False
+                    ),
                     f"Content mismatch for file '{allowed_file}'",
                 )
 
             # Check that excluded files were NOT copied
-            for excluded_file in excluded_files.keys():
-                self.assertNotIn(
-                    excluded_file,
-                    dst_files,
-                    f"Excluded file '{excluded_file}' should NOT have been synced",
-                )
+            leaked = set(excluded_files) & dst_files
+            self.assertFalse(
+                leaked, f"Excluded files should NOT have been synced: {sorted(leaked)}"
+            )
 
             # Verify exact count
             self.assertEqual(
@@ -229,21 +328,36 @@ class ExtensionFilteringTester(unittest.TestCase):
             print(f"   - Allowed extensions: {ALLOWED_EXTENSIONS}")
 
 
+class FileClassificationTester(unittest.TestCase):
+    """Test the precompiled extension patterns used to classify changed files."""
+
+    def test_classification(self) -> None:
+        """Library and asset classification matches the extension lists."""
+        for path in _LIBRARY_FILES:
+            with self.subTest(path=path):
+                self.assertTrue(_is_library_affecting_file(path))
+                self.assertFalse(_is_asset_only_file(path))
+        for path in _ASSET_FILES:
+            with self.subTest(path=path):
+                self.assertTrue(_is_asset_only_file(path))
+                self.assertFalse(_is_library_affecting_file(path))
+        self.assertFalse(_is_library_affecting_file(_UNCLASSIFIED_FILE))
+        self.assertFalse(_is_asset_only_file(_UNCLASSIFIED_FILE))
+
+    def test_patterns_are_not_retranslated(self) -> None:
+        """Classifying files must not re-translate the glob patterns."""
+        library_file, asset_file = _LIBRARY_FILES[0], _ASSET_FILES[0]
+        with patch("fnmatch.translate") as mock_translate:
+            for _ in range(1000):
+                _is_library_affecting_file(library_file)
+                _is_asset_only_file(asset_file)
+        mock_translate.assert_not_called()
+
+
+@unittest.skipIf(_FIND_UNAVAILABLE, _FIND_UNAVAILABLE_REASON)
 class ExcludePathsTester(unittest.TestCase):
     """Test that _sync_directory with exclude_paths preserves dist/ and node_modules/."""
 
-    def setUp(self) -> None:
-        import sys
-
-        if sys.platform == "win32":
-            return
-
-        find_cmd = shutil.which("find")
-        if not find_cmd:
-            self.skipTest(
-                "Unix find command not available - file sync will use Python fallback"
-            )
-
     def test_sync_directory_preserves_excluded_dist(self) -> None:
         """Test that dist/ files in destination are NOT deleted when excluded."""
         with tempfile.TemporaryDirectory() as tmpdir:
@@ -339,85 +453,61 @@ class ExcludePathsTester(unittest.TestCase):
             )
 
 
+# Skip if integration tests not enabled (this downloads large files)
+@unittest.skipUnless(
+    _RUN_INTEGRATION_TESTS,
+    "Integration tests not enabled. Set RUN_INTEGRATION_TESTS=1",
+)
 class SyncTester(unittest.TestCase):
     """Main tester class."""
 
-    def setUp(self):
-        """Set up test environment."""
-        # Skip if integration tests not enabled (this downloads large files)
-        if not os.environ.get("RUN_INTEGRATION_TESTS"):
-            self.skipTest("Integration tests not enabled. Set RUN_INTEGRATION_TESTS=1")
+    _fastled_src: Path
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        """Download and extract the FastLED archive once for the whole class."""
+        cls._fastled_src = _fastled_master_dir() / "src"
+
+    def setUp(self) -> None:
+        """Give each test a fresh destination, sharing the extracted source."""
+        # A synced FastLED tree holds thousands of files; on Windows, scanners
+        # can briefly hold some of them open, which must not fail the test
+        dst_root = tempfile.TemporaryDirectory(ignore_cleanup_errors=True)
+        self.addCleanup(dst_root.cleanup)
+        self.sync_dst = Path(dst_root.name)
 
     def test_glob(self) -> None:
         """Test command line interface (CLI)."""
-        # Define the glob pattern and the directory to search
-        SYNC_DATA_SRC.mkdir(parents=True, exist_ok=True)
-        # SYNC_DATA_DST.mkdir(parents=True, exist_ok=True)
-
-        # Use cached download to speed up repeated test runs
-        cached_zip = CACHE_DIR / "fastled-master.zip"
-        src_zip = SYNC_DATA_SRC / "master.zip"
-
-        if not cached_zip.exists():
-            print("Downloading FastLED repository (cached for future runs)...")
-            response = httpx.get(URL, follow_redirects=True)
-            content = response.content
-            assert len(content) >= 10000, "Downloaded file is too small"
-            with open(cached_zip, "wb") as f:
-                f.write(content)
-            print(f"Downloaded and cached: {cached_zip}")
-        else:
-            print(f"Using cached download: {cached_zip}")
-
-        # Copy from cache to test location
-        shutil.copy2(cached_zip, src_zip)
-
-        # unzip the file
-        # assert that the file exists
-        assert (SYNC_DATA_SRC / "master.zip").exists(), "File not found"
-        with zipfile.ZipFile(SYNC_DATA_SRC / "master.zip", "r") as zip_ref:
-            zip_ref.extractall(SYNC_DATA_SRC)
-
-        first_dir = _get_first_directory(SYNC_DATA_SRC)
-        print(f"first_dir: {first_dir}")
-        assert first_dir.is_dir(), f"Expected {first_dir.absolute()} to be a directory"
-        assert (first_dir / "src").exists(), "Expected FastLED-master directory"
-        assert (first_dir / "src" / "FastLED.h").exists(), "Expected FastLED.h file"
-
-        shutil.rmtree(SYNC_DATA_DST, ignore_errors=True)
-
-        fastled_src = first_dir / "src"
+        sync_dst = self.sync_dst
         sync_fastled(
-            fastled_src,
-            SYNC_DATA_DST / "fastled" / "src",
+            self._fastled_src,
+            sync_dst / "fastled" / "src",
         )
 
         # # now test that sync_fastled copied the files
         self.assertTrue(
-            (SYNC_DATA_DST / "fastled" / "src").exists(),
+            (sync_dst / "fastled" / "src").exists(),
             "Expected fastled/src directory",
         )
         self.assertTrue(
-            (SYNC_DATA_DST / "fastled" / "src" / "FastLED.h").exists(),
+            (sync_dst / "fastled" / "src" / "FastLED.h").exists(),
             "Expected FastLED.h file",
         )
         self.assertTrue(
-            (SYNC_DATA_DST / "fastled" / "examples").exists(),
+            (sync_dst / "fastled" / "examples").exists(),
             "Expected fastled/examples directory",
         )
         self.assertTrue(
-            (SYNC_DATA_DST / "fastled" / "examples" / "Blink").exists(),
+            (sync_dst / "fastled" / "examples" / "Blink").exists(),
             "Expected fastled/examples/Blink directory",
         )
         # Unity build includes all platform directories
         # arm directory should now be synced if present in source
         self.assertTrue(
-            (
-                SYNC_DATA_DST / "fastled" / "src" / "platforms" / "assert_defs.h"
-            ).exists(),
+            (sync_dst / "fastled" / "src" / "platforms" / "assert_defs.h").exists(),
             "Expected assert_defs.h file",
         )
-        # assert (SYNC_DATA_DST / "fastled" / "examples" / "Blink" / "Blink.ino").exists(), "Expected Blink.ino file"
+        # assert (sync_dst / "fastled" / "examples" / "Blink" / "Blink.ino").exists(), "Expected Blink.ino file"
 
 
 if __name__ == "__main__":
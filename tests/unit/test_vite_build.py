@@ -2,6 +2,7 @@
 
 import tempfile
 import unittest
+from collections.abc import Callable
 from pathlib import Path
 from typing import Any
 from unittest.mock import MagicMock, patch
@@ -9,6 +10,25 @@ from unittest.mock import MagicMock, patch
 from fastled_wasm_compiler.vite_build import ensure_vite_built
 
 
+class _CountingRun:
+    """Stand-in for subprocess.run that counts calls without recording them.
+
+    Used where a test only checks how often subprocess.run was called, so
+    no call arguments need to be kept around.
+    """
+
+    def __init__(self, result: Any, on_call: Callable[[], None] | None = None):
+        self.result = result
+        self.on_call = on_call
+        self.calls = 0
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        self.calls += 1
+        if self.on_call is not None:
+            self.on_call()
+        return self.result
+
+
 class TestEnsureViteBuilt(unittest.TestCase):
     """Tests for ensure_vite_built()."""
 
@@ -66,20 +86,18 @@ class TestEnsureViteBuilt(unittest.TestCase):
             mock_result = MagicMock()
             mock_result.returncode = 0
 
-            with patch("shutil.which", return_value="/usr/bin/npx"):
-                with patch("subprocess.run", return_value=mock_result) as mock_run:
-
-                    def side_effect(*args: Any, **kwargs: Any) -> Any:
-                        dist_dir.mkdir(exist_ok=True)
-                        (dist_dir / "index.html").write_text("<html></html>")
-                        (dist_dir / "index.js").write_text("// built")
-                        return mock_result
+            def build_dist() -> None:
+                dist_dir.mkdir(exist_ok=True)
+                (dist_dir / "index.html").write_text("<html></html>")
+                (dist_dir / "index.js").write_text("// built")
 
-                    mock_run.side_effect = side_effect
+            run = _CountingRun(mock_result, on_call=build_dist)
+            with patch("shutil.which", return_value="/usr/bin/npx"):
+                with patch("subprocess.run", new=run):
                     result = ensure_vite_built(compiler_dir)
 
                     self.assertEqual(result, dist_dir)
-                    mock_run.assert_called_once()
+                    self.assertEqual(run.calls, 1)
 
     def test_npm_install_runs_when_node_modules_missing(self) -> None:
         """If node_modules/ is missing, npm install runs before vite build."""
@@ -163,7 +181,7 @@ class TestEnsureViteBuilt(unittest.TestCase):
             mock_result.stderr = "sh: 1: vite: not found"
 
             with patch("shutil.which", return_value="/usr/bin/npx"):
-                with patch("subprocess.run", return_value=mock_result):
+                with patch("subprocess.run", new=_CountingRun(mock_result)):
                     with self.assertRaises(RuntimeError) as ctx:
                         ensure_vite_built(compiler_dir)
                     self.assertIn("Vite build failed", str(ctx.exception))
@@ -185,7 +203,7 @@ class TestEnsureViteBuilt(unittest.TestCase):
                 return None
 
             with patch("shutil.which", side_effect=which_side_effect):
-                with patch("subprocess.run", return_value=mock_result):
+                with patch("subprocess.run", new=_CountingRun(mock_result)):
                     with self.assertRaises(RuntimeError) as ctx:
                         ensure_vite_built(compiler_dir)
                     self.assertIn("npm install failed", str(ctx.exception))
@@ -200,7 +218,7 @@ class TestEnsureViteBuilt(unittest.TestCase):
             mock_result.returncode = 0
 
             with patch("shutil.which", return_value="/usr/bin/npx"):
-                with patch("subprocess.run", return_value=mock_result):
+                with patch("subprocess.run", new=_CountingRun(mock_result)):
                     with self.assertRaises(RuntimeError) as ctx:
                         ensure_vite_built(compiler_dir)
                     self.assertIn("dist/ directory was not created", str(ctx.exception))
@@ -6,102 +6,28 @@ and auto-generated index files with links to manifests and reconstruction files.
 """
 
 import json
+import os
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
 from typing import Any
 
-
-def get_file_info(file_path: Path) -> dict[str, Any]:
-    """
-    Get information about a file including size and type.
-
-    Args:
-        file_path: Path to the file
-
-    Returns:
-        Dictionary with file information
-    """
-    if not file_path.exists():
-        return {}
-
-    stat = file_path.stat()
-    file_type = "Unknown"
-
-    if file_path.suffix == ".xz" and file_path.name.endswith(".tar.xz"):
-        file_type = "Complete Archive"
-    elif ".tar.xz.part" in file_path.name:
-        file_type = "Split Archive Part"
-    elif file_path.name.endswith("-reconstruct.sh"):
-        file_type = "Reconstruction Script"
-    elif file_path.name.endswith("-manifest.txt"):
-        file_type = "Manifest File"
-    elif file_path.suffix == ".json":
-        file_type = "JSON Manifest"
-    elif file_path.suffix == ".wasm":
-        file_type = "WebAssembly Module"
-    elif file_path.suffix == ".js":
-        file_type = "JavaScript Module"
-    elif file_path.suffix == ".html":
-        file_type = "HTML File"
-    elif file_path.suffix == ".css":
-        file_type = "CSS Stylesheet"
-
-    return {
-        "name": file_path.name,
-        "size": stat.st_size,
-        "size_mb": stat.st_size / (1024 * 1024),
-        "type": file_type,
-        "path": str(
-            file_path.relative_to(file_path.parent.parent)
-            if file_path.parent.parent in file_path.parents
-            else file_path.name
-        ),
-    }
-
-
-def generate_platform_index_html(
-    output_dir: Path,
-    platforms: dict[str, dict[str, Any]],
-    title: str = "FastLED WASM Compiler - Artifacts",
-    subtitle: str = "Platform-specific build artifacts",
-    base_url: str | None = None,
-) -> Path:
-    """
-    Generate an index.html file for platform-organized artifacts.
-
-    Args:
-        output_dir: Directory where the index.html will be created
-        platforms: Dictionary mapping platform names to their info and files
-        title: Page title
-        subtitle: Page subtitle
-        base_url: Base URL for downloads (optional)
-
-    Returns:
-        Path to the generated index.html file
-    """
-    index_path = output_dir / "index.html"
-    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
-
-    # Platform icons mapping
-    platform_icons = {
-        "ubuntu": "🐧",
-        "linux": "🐧",
-        "macos": "🍎",
-        "macos-x86_64": "🍎",
-        "macos-arm64": "🍎",
-        "windows": "🪟",
-        "wasm": "🌐",
-        "web": "🌐",
-    }
-
-    html_content = f"""<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{title}</title>
-    <style>
-        body {{
+# Platform icons mapping
+_PLATFORM_ICONS = {
+    "ubuntu": "🐧",
+    "linux": "🐧",
+    "macos": "🍎",
+    "macos-x86_64": "🍎",
+    "macos-arm64": "🍎",
+    "windows": "🪟",
+    "wasm": "🌐",
+    "web": "🌐",
+}
+_DEFAULT_ICON = "💻"
+
+# Stylesheet inlined into the generated index.html
+_CSS = """\
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, Oxygen, Ubuntu, Cantarell, sans-serif;
             max-width: 1200px;
             margin: 0 auto;
@@ -109,8 +35,8 @@ def generate_platform_index_html(
             line-height: 1.6;
             color: #333;
             background: #f5f5f5;
-        }}
-        .header {{
+        }
+        .header {
             text-align: center;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
@@ -118,111 +44,210 @@ def generate_platform_index_html(
             border-radius: 10px;
             margin-bottom: 2rem;
             box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             margin: 0;
             font-size: 2.5rem;
-        }}
-        .header p {{
+        }
+        .header p {
             margin: 0.5rem 0 0 0;
             opacity: 0.9;
-        }}
-        .platforms {{
+        }
+        .platforms {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(300px, 1fr));
             gap: 1.5rem;
             margin-bottom: 2rem;
-        }}
-        .platform-card {{
+        }
+        .platform-card {
             background: white;
             border-radius: 10px;
             padding: 1.5rem;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
             border: 1px solid #e1e5e9;
-        }}
-        .platform-card h2 {{
+        }
+        .platform-card h2 {
             color: #2c3e50;
             margin-top: 0;
             display: flex;
             align-items: center;
             gap: 0.5rem;
-        }}
-        .platform-icon {{
+        }
+        .platform-icon {
             font-size: 1.5rem;
-        }}
-        .file-list {{
+        }
+        .file-list {
             list-style: none;
             padding: 0;
             margin: 1rem 0;
-        }}
-        .file-list li {{
+        }
+        .file-list li {
             background: #f8f9fa;
             border: 1px solid #e9ecef;
             border-radius: 5px;
             margin: 0.5rem 0;
             overflow: hidden;
-        }}
-        .file-link {{
+        }
+        .file-link {
             display: block;
             padding: 0.75rem 1rem;
             text-decoration: none;
             color: #495057;
             transition: background-color 0.2s;
-        }}
-        .file-link:hover {{
+        }
+        .file-link:hover {
             background-color: #e9ecef;
             color: #2c3e50;
-        }}
-        .file-type {{
+        }
+        .file-type {
             font-size: 0.8rem;
             color: #6c757d;
             font-weight: normal;
-        }}
-        .file-size {{
+        }
+        .file-size {
             font-size: 0.8rem;
             color: #6c757d;
             float: right;
-        }}
-        .instructions {{
+        }
+        .instructions {
             background: white;
             border-radius: 10px;
             padding: 1.5rem;
             box-shadow: 0 2px 4px rgba(0,0,0,0.1);
             border-left: 4px solid #28a745;
-        }}
-        .instructions h2 {{
+        }
+        .instructions h2 {
             color: #28a745;
             margin-top: 0;
-        }}
-        .instructions code {{
+        }
+        .instructions code {
             background: #f8f9fa;
             padding: 2px 4px;
             border-radius: 3px;
             font-family: 'Monaco', 'Menlo', 'Ubuntu Mono', monospace;
-        }}
-        .instructions pre {{
+        }
+        .instructions pre {
             background: #f8f9fa;
             padding: 1rem;
             border-radius: 5px;
             overflow-x: auto;
             border: 1px solid #e9ecef;
-        }}
-        .footer {{
+        }
+        .footer {
             text-align: center;
             margin-top: 2rem;
             padding-top: 1rem;
             border-top: 1px solid #e1e5e9;
             color: #6c757d;
-        }}
-        .timestamp {{
+        }
+        .timestamp {
             font-size: 0.9rem;
             color: #6c757d;
-        }}
-        .warning {{
+        }
+        .warning {
             color: #dc3545;
             font-weight: bold;
-        }}
-    </style>
+        }
+"""
+
+
+@lru_cache(maxsize=64)
+def _resolve_icon(name_lc: str) -> str:
+    """Return the icon for a lowercased platform name.
+
+    Exact names win; otherwise the first icon key contained in the name is
+    used, so e.g. "ubuntu-x86_64" gets the ubuntu icon.
+    """
+    if name_lc in _PLATFORM_ICONS:
+        return _PLATFORM_ICONS[name_lc]
+    for key, icon in _PLATFORM_ICONS.items():
+        if key in name_lc:
+            return icon
+    return _DEFAULT_ICON
+
+
+def get_file_info(
+    file_path: Path, stat_result: os.stat_result | None = None
+) -> dict[str, Any]:
+    """
+    Get information about a file including size and type.
+
+    Args:
+        file_path: Path to the file
+        stat_result: Already known stat of the file, e.g. from os.scandir
+
+    Returns:
+        Dictionary with file information
+    """
+    stat = stat_result
+    if stat is None:
+        try:
+            stat = file_path.stat()
+        except OSError:
+            return {}
+    file_type = "Unknown"
+
+    if file_path.suffix == ".xz" and file_path.name.endswith(".tar.xz"):
+        file_type = "Complete Archive"
+    elif ".tar.xz.part" in file_path.name:
+        file_type = "Split Archive Part"
+    elif file_path.name.endswith("-reconstruct.sh"):
+        file_type = "Reconstruction Script"
+    elif file_path.name.endswith("-manifest.txt"):
+        file_type = "Manifest File"
+    elif file_path.suffix == ".json":
+        file_type = "JSON Manifest"
+    elif file_path.suffix == ".wasm":
+        file_type = "WebAssembly Module"
+    elif file_path.suffix == ".js":
+        file_type = "JavaScript Module"
+    elif file_path.suffix == ".html":
+        file_type = "HTML File"
+    elif file_path.suffix == ".css":
+        file_type = "CSS Stylesheet"
+
+    return {
+        "name": file_path.name,
+        "size": stat.st_size,
+        "size_mb": stat.st_size / (1024 * 1024),
+        "type": file_type,
+        # Relative to the grandparent: "<platform dir>/<file name>"
+        "path": os.path.join(file_path.parent.name, file_path.name),
+    }
+
+
+def generate_platform_index_html(
+    output_dir: Path,
+    platforms: dict[str, dict[str, Any]],
+    title: str = "FastLED WASM Compiler - Artifacts",
+    subtitle: str = "Platform-specific build artifacts",
+    base_url: str | None = None,
+) -> Path:
+    """
+    Generate an index.html file for platform-organized artifacts.
+
+    Args:
+        output_dir: Directory where the index.html will be created
+        platforms: Dictionary mapping platform names to their info and files
+        title: Page title
+        subtitle: Page subtitle
+        base_url: Base URL for downloads (optional)
+
+    Returns:
+        Path to the generated index.html file
+    """
+    index_path = output_dir / "index.html"
+    timestamp = datetime.now(timezone.utc).strftime("%Y-%m-%d %H:%M:%S UTC")
+
+    parts: list[str] = []
+    parts.append(f"""<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <title>{title}</title>
+    <style>
+{_CSS}    </style>
 </head>
 <body>
     <div class="header">
@@ -232,7 +257,7 @@ def generate_platform_index_html(
     </div>
 
     <div class="platforms">
-"""
+""")
 
     # Add platform sections
     for platform_name, platform_info in platforms.items():
@@ -240,19 +265,14 @@ def generate_platform_index_html(
         files = platform_info.get("files", [])
         description = platform_info.get("description", "")
 
-        # Get platform icon
-        icon = platform_icons.get(platform_name.lower(), "💻")
-        for key in platform_icons:
-            if key in platform_name.lower():
-                icon = platform_icons[key]
-                break
+        icon = _resolve_icon(platform_name.lower())
 
-        html_content += f"""
+        parts.append(f"""
         <div class="platform-card">
             <h2><span class="platform-icon">{icon}</span> {display_name}</h2>
             {f'<p>{description}</p>' if description else ''}
             <ul class="file-list">
-"""
+""")
 
         for file_info in files:
             file_name = file_info["name"]
@@ -278,7 +298,7 @@ def generate_platform_index_html(
             if file_size_mb > 95:
                 size_warning = '<span class="warning"> (Large file!)</span>'
 
-            html_content += f"""
+            parts.append(f"""
                 <li>
                     <a href="{download_url}" class="file-link">
                         {file_name} 
@@ -286,15 +306,15 @@ def generate_platform_index_html(
                         <span class="file-size">{size_str}{size_warning}</span>
                     </a>
                 </li>
-"""
+""")
 
-        html_content += """
+        parts.append("""
             </ul>
         </div>
-"""
+""")
 
     # Add instructions and footer
-    html_content += f"""
+    parts.append(f"""
     </div>
 
     <div class="instructions">
@@ -338,7 +358,8 @@ import Module from './[platform]/fastled.js';</code></pre>
     </div>
 </body>
 </html>
-"""
+""")
+    html_content = "".join(parts)
 
     # Write the file
     output_dir.mkdir(parents=True, exist_ok=True)
@@ -362,9 +383,12 @@ def scan_platform_directory(platform_dir: Path) -> list[dict[str, Any]]:
     if not platform_dir.exists():
         return files
 
-    for file_path in sorted(platform_dir.iterdir()):
-        if file_path.is_file():
-            files.append(get_file_info(file_path))
+    # DirEntry caches the stat, so each file is stat'ed once
+    with os.scandir(platform_dir) as it:
+        entries = sorted(it, key=lambda entry: entry.name)
+    for entry in entries:
+        if entry.is_file():
+            files.append(get_file_info(Path(entry.path), entry.stat()))
 
     return files
 
@@ -403,8 +427,10 @@ def generate_manifest_json(
             "files": platform_info.get("files", []),
         }
 
+    # Serialize in one go rather than letting json.dump issue many small writes
+    manifest_json_str = json.dumps(manifest_data, indent=2, sort_keys=True)
     with open(manifest_path, "w", encoding="utf-8") as f:
-        json.dump(manifest_data, f, indent=2, sort_keys=True)
+        f.write(manifest_json_str)
 
     return manifest_path
 
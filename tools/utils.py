@@ -4,8 +4,12 @@ These are copies of functions from the main package to avoid circular imports.
 """
 
 import hashlib
+import shutil
 from pathlib import Path
 
+# Read size used when copying and hashing in one pass
+_COPY_CHUNK_SIZE = 1 << 20
+
 
 def hash_file(file_path: Path) -> str:
     """Calculate MD5 hash of a file."""
@@ -16,6 +20,21 @@ def hash_file(file_path: Path) -> str:
     return hasher.hexdigest()
 
 
+def copy_and_hash_file(src: Path, dst: Path) -> str:
+    """Copy src to dst like shutil.copy2 and return the MD5 hash of src.
+
+    The source is read once and each chunk is both hashed and written,
+    instead of copying the file and then reading it again to hash it.
+    """
+    hasher = hashlib.md5()
+    with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+        while chunk := fsrc.read(_COPY_CHUNK_SIZE):
+            hasher.update(chunk)
+            fdst.write(chunk)
+    shutil.copystat(src, dst)
+    return hasher.hexdigest()
+
+
 def banner(msg: str) -> str:
     """
     Create a banner for the given message.